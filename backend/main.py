@@ -1,16 +1,202 @@
-# import os
+import time
 
-from fastapi import FastAPI, HTTPException
+# awal import app (sebelum import services.* yang berat); dipakai untuk breakdown waktu startup di /ready
+_IMPORT_STARTED = time.perf_counter()
+
+import os
+import json
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from services.sentiment import SentimentAnalyzer
-from services.scraper import scrape_search
+from services.cache import PredictionCache
+from services.scraper import scrape_search, iter_scrape_search, ResourcePolicy
+from services.batcher import InferenceBatcher
+from services.executor import create_inference_executor
+from services.browser_pool import BrowserPool
+from services.dataset import DatasetWriter, query_slug
+from services.aggregator import SentimentAggregator
+from services.near_dup import NearDuplicateIndex, cluster_texts, expand_collapsed
+from services.seen_store import SeenStore
+from services.model_loader import ModelLoader
+from services.registry import MODEL_REGISTRY_DIR, resolve_model
+from services.jobs import JOB_STATES, Job, JobQueue
+from services.metrics import (
+    ANALYZE_INFLIGHT_BATCHES,
+    ANALYZE_QUEUE_DEPTH,
+    HTTP_REQUEST_SECONDS,
+    render_metrics,
+)
 
 load_dotenv()
-app = FastAPI(title="Tweet Scraper & Sentiment API")
+
+# Konfigurasi micro-batching untuk /analyze
+ANALYZE_MAX_BATCH = int(os.getenv("ANALYZE_MAX_BATCH", "64"))
+ANALYZE_MAX_WAIT_MS = float(os.getenv("ANALYZE_MAX_WAIT_MS", "10"))
+# token budget per batch model; kosong = batch tetap 32 baris
+ANALYZE_MAX_TOKENS = int(os.getenv("ANALYZE_MAX_TOKENS", "0")) or None
+# jumlah teks per potongan yang dikirim oleh /analyze/stream
+ANALYZE_STREAM_CHUNK = int(os.getenv("ANALYZE_STREAM_CHUNK", "32"))
+
+# Batas concurrency terpisah: inference (thread pool sendiri) vs scraping (event loop)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+INFERENCE_TORCH_THREADS = int(os.getenv("INFERENCE_TORCH_THREADS", "0")) or None
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "2"))
+# Chromium dipakai ulang antar request; context di-recycle setelah N kali pakai
+BROWSER_CONTEXT_MAX_USES = int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+BROWSER_LOGIN_TTL = float(os.getenv("BROWSER_LOGIN_TTL", "600"))
+# blok gambar/video/font/tracker dan pakai wait strategy ringan untuk page.goto
+SCRAPE_BLOCK_RESOURCES = os.getenv("SCRAPE_BLOCK_RESOURCES", "1") == "1"
+SCRAPE_WAIT_UNTIL = os.getenv("SCRAPE_WAIT_UNTIL", "domcontentloaded")
+# kalau diisi, hasil scrape juga disimpan sebagai Parquet terpartisi (query/tanggal)
+DATASET_DIR = os.getenv("DATASET_DIR") or None
+
+# Backend model: "torch" (default) atau "onnx" (ONNX Runtime CPU, opsional int8)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "0") == "1"
+
+# Cache prediksi: LRU di memori, opsional SQLite supaya awet setelah restart
+MODEL_NAME = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_DB = os.getenv("PREDICTION_CACHE_DB") or None
+
+# Ringkasan sentimen inkremental per query (GET /summary); query lama dibuang (LRU)
+SUMMARY_MAX_QUERIES = int(os.getenv("SUMMARY_MAX_QUERIES", "100"))
+# opsional: file stopwords (satu kata per baris) untuk counter n-gram ringkasan
+SUMMARY_STOPWORDS_FILE = os.getenv("SUMMARY_STOPWORDS_FILE") or None
+
+# Near-duplicate (MinHash/LSH), opt-in per request: scrape dengan drop_near_duplicates=true
+# membuang tweet hampir sama, /analyze dengan collapse_near_duplicates=true cukup men-skor
+# satu representative per cluster. Jangan turunkan jauh di bawah 0.9: tweet yang beda satu
+# kata opini ("bagus"/"jelek") sudah mirip ~0.7 dan akan ikut tergabung; 0 = nonaktif
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.9"))
+
+# Dedup tweet lintas run (Bloom filter per query di disk); kosong = per request saja
+SEEN_STORE_DIR = os.getenv("SEEN_STORE_DIR") or None
+SEEN_CAPACITY = int(os.getenv("SEEN_CAPACITY", "100000"))
+SEEN_FP_RATE = float(os.getenv("SEEN_FP_RATE", "0.001"))
+SEEN_WINDOW_DAYS = float(os.getenv("SEEN_WINDOW_DAYS", "7"))
+
+# Startup model: "background" (load di thread inference, app langsung jalan),
+# "lazy" (load saat request pertama), atau "eager" (startup menunggu model)
+MODEL_LOAD = os.getenv("MODEL_LOAD", "background")
+MODEL_REGISTRY = os.getenv("MODEL_REGISTRY_DIR") or MODEL_REGISTRY_DIR
+# 1 = wajib dari registry lokal, jangan pernah download dari hub saat startup
+MODEL_OFFLINE = os.getenv("MODEL_OFFLINE", "0") == "1"
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"
+# batas tunggu request /analyze selama model masih loading (detik)
+MODEL_READY_TIMEOUT = float(os.getenv("MODEL_READY_TIMEOUT", "120"))
+
+# Job scrape/analyze di background (/jobs): jumlah worker, batas antrean,
+# jumlah job selesai yang disimpan di memori, dan folder JSON hasil (kosong = memori saja)
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "100"))
+JOBS_MAX_KEPT = int(os.getenv("JOBS_MAX_KEPT", "200"))
+JOBS_DIR = os.getenv("JOBS_DIR") or None
+
+# key cache ikut backend, karena hasil int8 bisa sedikit beda dari fp32
+cache_namespace = f"{MODEL_NAME}:{INFERENCE_BACKEND}{':int8' if ONNX_QUANTIZE else ''}"
+prediction_cache = PredictionCache(
+    cache_namespace, max_entries=PREDICTION_CACHE_SIZE, db_path=PREDICTION_CACHE_DB
+)
+
+
+def _load_analyzer():
+    started = time.perf_counter()
+    # torch/transformers baru di-import di sini (thread inference), bukan saat import app
+    from services.sentiment import SentimentAnalyzer
+
+    imported = time.perf_counter()
+    model_path = resolve_model(MODEL_NAME, MODEL_REGISTRY, offline=MODEL_OFFLINE)
+    resolved = time.perf_counter()
+    if model_path is None:
+        print(f"🔴[WARNING] {MODEL_NAME} belum ada di registry {MODEL_REGISTRY}, load dari hub")
+    analyzer = SentimentAnalyzer(
+        MODEL_NAME,
+        cache=prediction_cache,
+        backend=INFERENCE_BACKEND,
+        quantize=ONNX_QUANTIZE,
+        model_path=model_path,
+    )
+    analyzer.load_timings = {
+        "import_torch": imported - started,
+        "resolve": resolved - imported,
+        **analyzer.load_timings,
+    }
+    return analyzer
+
+
+def _predict(texts: List[str]):
+    # batch di sini gabungan beberapa request; collapse near-duplicate dilakukan
+    # per request di _submit supaya hasil satu client tidak bergantung client lain
+    return model_loader.get().predict_batch(texts, batch_size=32, max_tokens=ANALYZE_MAX_TOKENS)
+
+
+inference_executor = create_inference_executor(
+    INFERENCE_WORKERS, torch_threads=INFERENCE_TORCH_THREADS
+)
+model_loader = ModelLoader(
+    _load_analyzer, mode=MODEL_LOAD, executor=inference_executor, warmup=MODEL_WARMUP
+)
+batcher = InferenceBatcher(
+    _predict,
+    max_batch_size=ANALYZE_MAX_BATCH,
+    max_wait_ms=ANALYZE_MAX_WAIT_MS,
+    executor=inference_executor,
+    max_concurrency=INFERENCE_WORKERS,
+)
+ANALYZE_QUEUE_DEPTH.set_function(lambda: batcher.queue_depth)
+ANALYZE_INFLIGHT_BATCHES.set_function(lambda: batcher.inflight)
+scrape_slots = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+browser_pool = BrowserPool(
+    headless=True,
+    size=SCRAPE_CONCURRENCY,
+    max_uses=BROWSER_CONTEXT_MAX_USES,
+    login_ttl=BROWSER_LOGIN_TTL,
+    resource_policy=(
+        ResourcePolicy(wait_until=SCRAPE_WAIT_UNTIL) if SCRAPE_BLOCK_RESOURCES else None
+    ),
+)
+job_queue = JobQueue(
+    workers=JOBS_WORKERS, max_queued=JOBS_MAX_QUEUED, max_jobs=JOBS_MAX_KEPT, root=JOBS_DIR
+)
+
+
+# detik per fase startup app (di luar fase load model, lihat model_loader.timings)
+startup_timings = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_timings["import_app"] = time.perf_counter() - _IMPORT_STARTED
+    started = time.perf_counter()
+    await model_loader.start()
+    startup_timings["model_start"] = time.perf_counter() - started
+    await batcher.start()
+    await job_queue.start()
+    started = time.perf_counter()
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # jangan gagalkan startup; pool akan coba launch lagi saat /scrape pertama
+        print(f"🔴[WARNING] gagal start browser pool: {e}")
+    startup_timings["browser_pool"] = time.perf_counter() - started
+    yield
+    await job_queue.stop()
+    await browser_pool.stop()
+    await batcher.stop()
+    inference_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Tweet Scraper & Sentiment API", lifespan=lifespan)
 
 # Izin untuk aplikasi Streamlit front-end origin selama development
 app.add_middleware(
@@ -22,17 +208,114 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # label pakai template route (/summary), bukan URL mentah, supaya jumlah series tetap kecil
+    route = request.scope.get("route")
+    labels = {
+        "method": request.method,
+        "path": getattr(route, "path", "unmatched"),
+        "status": str(response.status_code),
+    }
+    body = response.body_iterator
+
+    # call_next selalu mengembalikan response yang body-nya di-stream; durasi dicatat
+    # setelah chunk terakhir terkirim, jadi /analyze/stream & /scrape/stream terukur penuh
+    async def timed_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, **labels)
+
+    response.body_iterator = timed_body()
+    return response
+
+
 class ScrapeRequest(BaseModel):
     query: str
     limit: int = 10
+    # "dom" (teks dari halaman) atau "network" (JSON timeline: id, waktu asli, author)
+    mode: str = "dom"
+    # buang tweet yang hampir sama (retweet/copy-paste) selama scrape ini
+    drop_near_duplicates: bool = False
+
+
+class ScrapeJobRequest(ScrapeRequest):
+    # langsung analisis sentimen tweet hasil scrape di job yang sama
+    analyze: bool = False
 
 
 class AnalyzeRequest(BaseModel):
     texts: List[str]
+    # kalau diisi, hasilnya ikut dijumlahkan ke ringkasan query ini (GET /summary)
+    query: Optional[str] = None
+    # skor satu representative per cluster near-duplicate di dalam request ini saja
+    collapse_near_duplicates: bool = False
+    # kalau diisi, ringkasan (SentimentAggregator) dari teks request ini saja ikut dikirim,
+    # dengan top-k kata/n-gram sebanyak ini; tidak bergantung state GET /summary bersama
+    summary_top_k: Optional[int] = None
+
+
+async def _submit(texts: List[str], collapse: bool = False) -> List[dict]:
+    """batcher.submit, opsional dengan collapse near-duplicate di dalam `texts` saja."""
+    if not (collapse and NEAR_DUP_THRESHOLD):
+        return await batcher.submit(texts)
+    reps = cluster_texts(texts, NEAR_DUP_THRESHOLD)
+    unique = sorted(set(reps))
+    scored = await batcher.submit([texts[i] for i in unique])
+    return expand_collapsed(texts, reps, dict(zip(unique, scored)))
+
+
+def _dataset_writer(query: str):
+    return DatasetWriter(query, root=DATASET_DIR) if DATASET_DIR else None
+
+
+def _seen_store(query: str):
+    return SeenStore(
+        query,
+        root=SEEN_STORE_DIR,
+        capacity=SEEN_CAPACITY,
+        fp_rate=SEEN_FP_RATE,
+        window_days=SEEN_WINDOW_DAYS,
+    )
+
+
+def _near_dup_index(enabled: bool):
+    return NearDuplicateIndex(NEAR_DUP_THRESHOLD) if enabled and NEAR_DUP_THRESHOLD else None
+
+
+def _load_stopwords() -> frozenset:
+    if not SUMMARY_STOPWORDS_FILE:
+        return frozenset()
+    with open(SUMMARY_STOPWORDS_FILE, "r", encoding="utf-8") as fh:
+        return frozenset(line.strip().lower() for line in fh if line.strip())
 
 
-# MODEL = "services/model/xlm-roberta-base"
-analyzer = SentimentAnalyzer()
+summary_stopwords = _load_stopwords()
+aggregators: "OrderedDict[str, SentimentAggregator]" = OrderedDict()
+
+
+def _aggregator(query: str) -> SentimentAggregator:
+    key = query_slug(query)
+    if key not in aggregators:
+        aggregators[key] = SentimentAggregator(stopwords=summary_stopwords)
+        while len(aggregators) > SUMMARY_MAX_QUERIES:
+            aggregators.popitem(last=False)
+    aggregators.move_to_end(key)
+    return aggregators[key]
+
+
+async def _require_model():
+    """503 kalau model belum siap dalam MODEL_READY_TIMEOUT detik atau gagal load."""
+    try:
+        await model_loader.wait(timeout=MODEL_READY_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Model masih loading, coba lagi nanti")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Model gagal load: {e}")
 
 
 @app.get("/")
@@ -40,30 +323,297 @@ async def root():
     return {"message": "Welcome to the Tweet Scraper API"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 kalau model sudah siap (setelah warmup), 503 kalau belum."""
+    status = model_loader.status()
+    status["timings"] = {
+        **{k: round(v, 3) for k, v in startup_timings.items()},
+        **status["timings"],
+    }
+    if status["ready"]:
+        return status
+    return JSONResponse(status_code=503, content=status)
+
+
 @app.post("/scrape")
 async def scrape(req: ScrapeRequest):
+    near_dups = _near_dup_index(req.drop_near_duplicates)
+    seen = _seen_store(req.query)
     try:
-        tweets = await scrape_search(
-            req.query, max_tweets=req.limit, headless=True, save_csv=False
-        )
-        return {"query": req.query, "count": len(tweets), "tweets": tweets}
-    except RuntimeError as e:
+        async with scrape_slots:
+            tweets = await scrape_search(
+                req.query,
+                max_tweets=req.limit,
+                headless=True,
+                save_csv=False,
+                pool=browser_pool,
+                mode=req.mode,
+                dataset_writer=_dataset_writer(req.query),
+                near_dup_index=near_dups,
+                seen_store=seen,
+            )
+        return {
+            "query": req.query,
+            "count": len(tweets),
+            "tweets": tweets,
+            "near_duplicates": near_dups.stats() if near_dups else None,
+            "seen": seen.stats(),
+        }
+    except (RuntimeError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/scrape/stream")
+async def scrape_stream(
+    query: str, limit: int = 10, mode: str = "dom", drop_near_duplicates: bool = False
+):
+    """
+    Server-sent events: kirim tiap tweet (`event: tweet`) begitu tertangkap,
+    progress tiap scroll (`event: progress`, berisi total & idle_rounds),
+    lalu `event: done` atau `event: error`.
+    """
+
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def generate():
+        try:
+            async with scrape_slots:
+                async for item in iter_scrape_search(
+                    query,
+                    max_tweets=limit,
+                    headless=True,
+                    save_csv=False,
+                    pool=browser_pool,
+                    mode=mode,
+                    dataset_writer=_dataset_writer(query),
+                    near_dup_index=_near_dup_index(drop_near_duplicates),
+                    seen_store=_seen_store(query),
+                ):
+                    yield sse(item.pop("type"), item)
+        except Exception as e:
+            yield sse("error", {"detail": str(e)})
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 @app.post("/analyze")
 async def analyze(req: AnalyzeRequest):
+    await _require_model()
     try:
-        results = analyzer.predict_batch(req.texts, batch_size=32)
-        return {"count": len(results), "results": results}
+        results = await _submit(req.texts, req.collapse_near_duplicates)
+        if req.query:
+            _aggregator(req.query).update(results)
+        response = {"count": len(results), "results": results}
+        if req.summary_top_k:
+            own = SentimentAggregator(stopwords=summary_stopwords)
+            own.update(results)
+            response["summary"] = own.summary(top_k=req.summary_top_k)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/analyze/stream")
+async def analyze_stream(req: AnalyzeRequest):
+    """
+    Versi streaming dari /analyze: tiap potongan ANALYZE_STREAM_CHUNK teks
+    dikirim sebagai NDJSON (satu hasil per baris, dengan `index` posisi input)
+    begitu selesai dihitung, jadi hasil tidak ditumpuk di memori server.
+    Dengan `summary_top_k`, baris terakhir berisi {"summary": ...} untuk request ini.
+    """
+    await _require_model()
+
+    async def generate():
+        own = SentimentAggregator(stopwords=summary_stopwords) if req.summary_top_k else None
+        for start in range(0, len(req.texts), ANALYZE_STREAM_CHUNK):
+            chunk = req.texts[start : start + ANALYZE_STREAM_CHUNK]
+            try:
+                results = await _submit(chunk, req.collapse_near_duplicates)
+            except Exception as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+                return
+            if req.query:
+                _aggregator(req.query).update(results)
+            if own is not None:
+                own.update(results)
+            yield "".join(
+                json.dumps({"index": start + i, **row}) + "\n"
+                for i, row in enumerate(results)
+            )
+        if own is not None:
+            yield json.dumps({"summary": own.summary(top_k=req.summary_top_k)}) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+async def _analyze_rows(
+    job: Job,
+    rows: List[dict],
+    query: Optional[str],
+    publish: bool = False,
+    collapse: bool = False,
+):
+    """
+    Skor `rows` per potongan ANALYZE_STREAM_CHUNK lewat batcher. Tiap row
+    tidak diubah di tempat: hasilnya digabung ke salinan, lalu salinan satu
+    potongan menggantikan row lama sekaligus (atau, dengan `publish`, baru
+    masuk ke `job.results`). Jadi halaman hasil tidak pernah berisi row
+    setengah jadi, walaupun `rows` adalah `job.results` yang sedang dibaca client.
+    """
+    await model_loader.wait(timeout=MODEL_READY_TIMEOUT)
+    job.update_progress(total=len(rows), analyzed=0)
+    for start in range(0, len(rows), ANALYZE_STREAM_CHUNK):
+        chunk = rows[start : start + ANALYZE_STREAM_CHUNK]
+        results = await _submit([row["text"] for row in chunk], collapse)
+        scored = [
+            {**row, **{k: v for k, v in result.items() if k != "text"}}
+            for row, result in zip(chunk, results)
+        ]
+        if query:
+            _aggregator(query).update(results)
+        if publish:
+            job.extend(scored)
+        else:
+            rows[start : start + len(scored)] = scored
+        job.update_progress(analyzed=start + len(chunk))
+
+
+async def _run_scrape_job(job: Job, req: ScrapeJobRequest):
+    near_dups = _near_dup_index(req.drop_near_duplicates)
+    seen = _seen_store(req.query)
+    async with scrape_slots:
+        async for item in iter_scrape_search(
+            req.query,
+            max_tweets=req.limit,
+            headless=True,
+            save_csv=False,
+            pool=browser_pool,
+            mode=req.mode,
+            dataset_writer=_dataset_writer(req.query),
+            near_dup_index=near_dups,
+            seen_store=seen,
+        ):
+            kind = item.pop("type")
+            if kind == "tweet":
+                job.extend([item["tweet"]])
+            elif kind == "done":
+                job.meta.update(near_duplicates=item["near_duplicates"], seen=item["seen"])
+            else:
+                job.update_progress(stage=kind, **item)
+    job.update_progress(stage="done")
+    if req.analyze and job.results:
+        job.update_progress(stage="analyze")
+        await _analyze_rows(job, job.results, req.query)
+
+
+async def _run_analyze_job(job: Job, req: AnalyzeRequest):
+    rows = [{"index": i, "text": text} for i, text in enumerate(req.texts)]
+    await _analyze_rows(job, rows, req.query, publish=True, collapse=req.collapse_near_duplicates)
+
+
+def _submit_job(kind: str, params: dict, runner) -> JSONResponse:
+    try:
+        job = job_queue.submit(kind, params, runner)
+    except ValueError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JSONResponse(status_code=202, content=job.info())
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' tidak ditemukan")
+    return job
+
+
+@app.post("/jobs/scrape", status_code=202)
+async def submit_scrape_job(req: ScrapeJobRequest):
+    """
+    Versi background dari /scrape: langsung balas job_id (202), scraping jalan
+    di worker job. Pantau lewat GET /jobs/{job_id}, ambil tweet (termasuk yang
+    sudah tertangkap selama job masih jalan) lewat GET /jobs/{job_id}/results.
+    """
+    return _submit_job("scrape", req.model_dump(), partial(_run_scrape_job, req=req))
+
+
+@app.post("/jobs/analyze", status_code=202)
+async def submit_analyze_job(req: AnalyzeRequest):
+    params = {"query": req.query, "n_texts": len(req.texts)}
+    return _submit_job("analyze", params, partial(_run_analyze_job, req=req))
+
+
+@app.get("/jobs")
+async def list_jobs(status: Optional[str] = None):
+    if status is not None and status not in JOB_STATES:
+        raise HTTPException(status_code=400, detail=f"status harus salah satu dari {JOB_STATES}")
+    return {**job_queue.stats(), "items": job_queue.list(status)}
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    return _get_job(job_id).info()
+
+
+@app.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, offset: int = 0, limit: int = 100):
+    """Satu halaman hasil; `next_offset` null kalau job selesai dan semua hasil sudah diambil."""
+    return _get_job(job_id).page(offset, min(max(limit, 1), 1000))
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, purge: bool = False):
+    """
+    Batalkan job yang masih antre/jalan; hasil parsial tetap bisa diambil.
+    Idempotent: job yang sudah selesai dikembalikan apa adanya. Dengan
+    `purge=true`, job yang sudah selesai dihapus beserta hasilnya.
+    """
+    job = _get_job(job_id)
+    if purge:
+        if not job_queue.delete(job_id):
+            raise HTTPException(status_code=409, detail="Job masih berjalan, batalkan dulu")
+        return {"job_id": job_id, "deleted": True}
+    job_queue.cancel(job_id)
+    return job.info()
+
+
+@app.get("/summary")
+async def summary(query: str, top_k: int = 10):
+    """Ringkasan inkremental (label, rata-rata probabilitas, top n-gram) untuk satu query."""
+    key = query_slug(query)
+    if key not in aggregators:
+        raise HTTPException(status_code=404, detail=f"Belum ada hasil analisis untuk '{query}'")
+    return {"query": query, **aggregators[key].summary(top_k=top_k)}
+
+
+@app.delete("/summary")
+async def reset_summary(query: str):
+    aggregators.pop(query_slug(query), None)
+    return {"query": query, "reset": True}
+
+
+@app.get("/scrape/pool")
+async def scrape_pool_stats():
+    return browser_pool.stats()
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return prediction_cache.stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Metrik latency per stage, ukuran batch, antrean, dan tweet per scroll (format Prometheus)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/test_analyzer")
 async def test_analyzer():
+    await _require_model()
     texts = ["I love this!", "I hate that!"]
-    results = analyzer.predict_batch(texts)
+    results = await batcher.submit(texts)
     return {"count": len(results), "results": results}
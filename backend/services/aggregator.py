@@ -0,0 +1,92 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+LABELS = ("Negative", "Neutral", "Positive")
+# sama dengan token_pattern default CountVectorizer (frontend/visualize.py)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+class TopKCounter:
+    """
+    Counter dengan jumlah key terbatas. Kalau key sudah lebih dari
+    2 x `capacity`, hanya `capacity` key terbesar yang disimpan (amortized
+    O(1) per update). Count key yang pernah dipangkas bisa kurang paling
+    banyak `max_dropped`; top-k di atas ambang itu tetap akurat.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self.max_dropped = 0
+        self._counts: Counter = Counter()
+
+    def update(self, items: Iterable[str]):
+        self._counts.update(items)
+        if len(self._counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        ranked = self._counts.most_common()
+        if len(ranked) > self.capacity:
+            self.max_dropped = max(self.max_dropped, ranked[self.capacity][1])
+        self._counts = Counter(dict(ranked[: self.capacity]))
+
+    def top(self, k: int) -> List[tuple]:
+        return self._counts.most_common(k)
+
+    def __len__(self):
+        return len(self._counts)
+
+
+class SentimentAggregator:
+    """
+    Ringkasan sentimen yang di-update per batch hasil `predict_batch`, jadi
+    biaya tiap update sebanding dengan jumlah tweet baru, bukan total tweet.
+    Menyimpan jumlah per label, jumlah probabilitas (untuk rata-rata), serta
+    counter unigram/bigram dari `cleaned_text` (huruf kecil, stopwords dibuang
+    sebelum bigram dibentuk, seperti CountVectorizer).
+    """
+
+    def __init__(
+        self,
+        labels: Iterable[str] = LABELS,
+        stopwords: Optional[Iterable[str]] = None,
+        capacity: int = 5000,
+    ):
+        self.labels = list(labels)
+        self.stopwords = frozenset(stopwords or ())
+        self.count = 0
+        self.near_duplicates = 0
+        self.label_counts: Counter = Counter()
+        self.prob_sums: Dict[str, float] = {label: 0.0 for label in self.labels}
+        self.unigrams = TopKCounter(capacity)
+        self.bigrams = TopKCounter(capacity)
+
+    def update(self, results: Iterable[Dict]):
+        stop = self.stopwords
+        for row in results:
+            self.count += 1
+            self.near_duplicates += bool(row.get("near_duplicate"))
+            self.label_counts[row["label"]] += 1
+            for label in self.labels:
+                self.prob_sums[label] += float(row.get(label, 0.0))
+            tokens = [
+                t for t in TOKEN_PATTERN.findall(str(row.get("cleaned_text", "")).lower())
+                if t not in stop
+            ]
+            self.unigrams.update(tokens)
+            self.bigrams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    def summary(self, top_k: int = 10) -> Dict:
+        return {
+            "count": self.count,
+            "near_duplicates": self.near_duplicates,
+            "duplicate_ratio": self.near_duplicates / self.count if self.count else 0.0,
+            "label_counts": {label: self.label_counts[label] for label in self.labels},
+            "mean_probabilities": {
+                label: (total / self.count if self.count else 0.0)
+                for label, total in self.prob_sums.items()
+            },
+            "unigrams": [{"ngram": g, "count": c} for g, c in self.unigrams.top(top_k)],
+            "bigrams": [{"ngram": g, "count": c} for g, c in self.bigrams.top(top_k)],
+        }
@@ -0,0 +1,181 @@
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+from typing import Optional
+
+import pandas as pd
+
+RESULT_COLUMNS = ["label", "cleaned_text", "Negative", "Neutral", "Positive"]
+
+
+def _checkpoint_path(output_path: str) -> str:
+    return output_path + ".ckpt.json"
+
+
+def _input_fingerprint(input_path: str) -> dict:
+    stat = os.stat(input_path)
+    return {"input": os.path.abspath(input_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _load_checkpoint(input_path: str, output_path: str) -> dict:
+    path = _checkpoint_path(output_path)
+    if not os.path.exists(path):
+        return {"rows_done": 0, "output_bytes": 0}
+    with open(path, "r", encoding="utf-8") as fh:
+        ckpt = json.load(fh)
+    expected = _input_fingerprint(input_path)
+    if any(ckpt.get(k) != v for k, v in expected.items()):
+        raise RuntimeError(
+            f"Checkpoint {path} dibuat untuk input lain / input sudah berubah. "
+            "Hapus checkpoint atau jalankan dengan --restart."
+        )
+    return ckpt
+
+
+def _save_checkpoint(input_path: str, output_path: str, rows_done: int, output_bytes: int):
+    path = _checkpoint_path(output_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(
+            {**_input_fingerprint(input_path), "rows_done": rows_done, "output_bytes": output_bytes},
+            fh,
+        )
+    os.replace(tmp, path)
+
+
+def count_rows(input_path: str) -> int:
+    """Jumlah baris data (tanpa header); pakai csv reader supaya newline di dalam tweet aman."""
+    with open(input_path, "r", encoding="utf-8", newline="") as fh:
+        return max(0, sum(1 for _ in csv.reader(fh)) - 1)
+
+
+def score_csv(
+    input_path: str,
+    output_path: str,
+    analyzer=None,
+    text_column: str = "text",
+    chunksize: int = 5000,
+    batch_size: int = 32,
+    max_tokens: Optional[int] = None,
+    restart: bool = False,
+) -> int:
+    """
+    Versi out-of-core dari `predict_from_csv`: baca CSV per `chunksize` baris,
+    skor dengan `SentimentAnalyzer.predict_batch` (services/sentiment.py), dan
+    append hasilnya ke `output_path` tiap chunk. Posisi disimpan di
+    `<output_path>.ckpt.json`, jadi kalau proses mati, jalankan ulang perintah
+    yang sama untuk lanjut dari chunk terakhir yang selesai.
+
+    `analyzer` boleh berupa `ShardedInferenceEngine` (services/sharded.py) untuk
+    membagi tiap chunk ke beberapa proses. Memori dibatasi satu chunk. Return
+    jumlah baris yang sudah di-skor.
+    """
+    if restart:
+        for path in (output_path, _checkpoint_path(output_path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    ckpt = _load_checkpoint(input_path, output_path)
+    rows_done = ckpt["rows_done"]
+    if os.path.exists(output_path):
+        # buang sisa tulisan chunk yang belum sempat di-checkpoint
+        with open(output_path, "r+b") as fh:
+            fh.truncate(ckpt["output_bytes"])
+
+    if analyzer is None:
+        from services.sentiment import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer()
+
+    total = count_rows(input_path)
+    if rows_done:
+        print(f"🔁 Lanjut dari baris {rows_done}/{total}")
+
+    started = time.perf_counter()
+    scored_this_run = 0
+    reader = pd.read_csv(
+        input_path,
+        chunksize=chunksize,
+        skiprows=range(1, rows_done + 1) if rows_done else None,
+    )
+    with open(output_path, "a", encoding="utf-8", newline="") as out:
+        for chunk in reader:
+            texts = chunk[text_column].fillna("").astype(str).tolist()
+            results = pd.DataFrame(
+                analyzer.predict_batch(texts, batch_size=batch_size, max_tokens=max_tokens)
+            )
+            final = pd.concat(
+                [chunk.reset_index(drop=True), results[RESULT_COLUMNS]], axis=1
+            )
+            final.to_csv(out, index=False, header=(rows_done == 0))
+            out.flush()
+            os.fsync(out.fileno())
+
+            rows_done += len(chunk)
+            scored_this_run += len(chunk)
+            _save_checkpoint(input_path, output_path, rows_done, out.tell())
+
+            elapsed = time.perf_counter() - started
+            rate = scored_this_run / elapsed if elapsed else 0.0
+            eta = (total - rows_done) / rate if rate else float("inf")
+            print(
+                f"[+] {rows_done}/{total} baris  {rate:.1f} baris/detik  "
+                f"ETA {eta / 60:.1f} menit"
+            )
+
+    print(f"✅ Selesai: {rows_done} baris tersimpan di {output_path}")
+    return rows_done
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend:
+    #   python -m services.batch_scorer dataset_tweets.csv tweets_scored.csv
+    parser = argparse.ArgumentParser(description="Skor sentimen CSV besar secara bertahap")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--column", default="text")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-tokens", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="abaikan checkpoint lama")
+    parser.add_argument(
+        "--workers",
+        default=None,
+        help="jumlah proses inference (services/sharded.py), atau 'auto' untuk benchmark dulu",
+    )
+    parser.add_argument("--threads", type=int, default=None, help="thread PyTorch per worker")
+    args = parser.parse_args()
+
+    engine = None
+    if args.workers:
+        from services.sharded import ShardedInferenceEngine, autotune
+
+        if args.workers == "auto":
+            sample = pd.read_csv(args.input, nrows=512)[args.column].fillna("").astype(str)
+            best = autotune(sample.tolist(), batch_size=args.batch_size)[0]
+            workers, threads = best["workers"], best["threads_per_worker"]
+        else:
+            workers, threads = int(args.workers), args.threads
+        engine = ShardedInferenceEngine(workers, threads)
+        print(f"[INFO] {engine.workers} worker x {engine.threads_per_worker} thread")
+
+    try:
+        score_csv(
+            args.input,
+            args.output,
+            analyzer=engine,
+            text_column=args.column,
+            chunksize=args.chunksize,
+            batch_size=args.batch_size,
+            max_tokens=args.max_tokens,
+            restart=args.restart,
+        )
+    except KeyboardInterrupt:
+        print("[INFO] 🔴 Dihentikan; jalankan perintah yang sama untuk melanjutkan")
+        sys.exit(130)
+    finally:
+        if engine is not None:
+            engine.stop()
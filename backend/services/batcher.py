@@ -0,0 +1,119 @@
+import asyncio
+from typing import Callable, List, Dict, Optional
+from concurrent.futures import Executor
+
+from services.metrics import ANALYZE_BATCH_SIZE
+
+
+class InferenceBatcher:
+    """
+    Gabungkan teks dari beberapa request /analyze yang datang bersamaan
+    menjadi satu batch, jalankan model di luar event loop, lalu kembalikan
+    potongan hasil ke masing-masing pemanggil.
+
+    Satu batch ditutup kalau jumlah teks sudah >= `max_batch_size` atau
+    `max_wait_ms` sudah lewat sejak request pertama di batch itu masuk.
+    Paling banyak `max_concurrency` batch berjalan bersamaan di `executor`;
+    selama itu batch berikutnya tetap dikumpulkan.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[str]], List[Dict]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 1,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._inflight):
+            task.cancel()
+
+    @property
+    def queue_depth(self) -> int:
+        """Request yang sudah masuk antrean tapi belum diambil ke batch."""
+        return self._queue.qsize()
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def submit(self, texts: List[str]) -> List[Dict]:
+        """Antrikan `texts` dan tunggu hasilnya (urutan sama dengan input)."""
+        if not texts:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            await slots.acquire()
+            pending = await self._collect()
+            task = asyncio.create_task(self._dispatch(pending))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, pending: list):
+        # buang request yang client-nya sudah putus sebelum batch jalan
+        pending = [(texts, fut) for texts, fut in pending if not fut.done()]
+        if not pending:
+            return
+
+        flat = [t for texts, _ in pending for t in texts]
+        ANALYZE_BATCH_SIZE.observe(len(flat))
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.predict_fn, flat)
+        except Exception as e:
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        offset = 0
+        for texts, fut in pending:
+            part = results[offset : offset + len(texts)]
+            offset += len(texts)
+            if not fut.done():
+                fut.set_result(part)
@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+from typing import Dict, List, Optional
+
+from services.metrics import INFERENCE_STAGE_SECONDS
+from services.registry import MODEL_REGISTRY_DIR
+
+# model kecil berbentuk XLM-RoBERTa (random init) supaya benchmark jalan offline & cepat;
+# angka absolutnya tidak mewakili model asli, tapi perbandingan antar commit tetap berarti
+TINY_MODEL_NAME = "bench/tiny-xlm-roberta"
+TINY_MODEL_DIR = os.path.join(MODEL_REGISTRY_DIR, "_bench_tiny_xlm_roberta")
+TINY_CONFIG = {
+    "hidden_size": 128,
+    "num_hidden_layers": 2,
+    "num_attention_heads": 4,
+    "intermediate_size": 512,
+    "max_position_embeddings": 514,
+    "num_labels": 3,
+}
+TINY_VOCAB_SIZE = 2000
+SEED = 1234
+
+WORDS = (
+    "produk bagus jelek banget samsung promo murah hari ini kecewa puas baterai "
+    "layar kamera harga servis cepat lambat pengiriman barang original mantap "
+    "recommended nice bad good love hate update aplikasi error lemot sinyal "
+    "tidak sangat kurang lebih sudah belum mau beli lagi toko online gratis ongkir"
+).split()
+EXTRAS = ["https://t.co/{}", "@user{}", "#tag{}", "&amp;", "😀", "🔥🔥", "wkwkwk", "!!!", "gooood"]
+
+
+def bench_corpus(n: int, seed: int = SEED) -> List[str]:
+    """
+    Tweet sintetis dengan panjang mirip data asli: kebanyakan pendek (median
+    ~14 kata) dengan ekor panjang sampai 120 kata.
+    """
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        length = max(2, min(120, int(rng.lognormvariate(2.6, 0.7))))
+        parts = []
+        for _ in range(length):
+            if rng.random() < 0.15:
+                parts.append(rng.choice(EXTRAS).format(rng.randint(0, 999)))
+            else:
+                parts.append(rng.choice(WORDS))
+        out.append(" ".join(parts))
+    return out
+
+
+def build_tiny_model(path: str = TINY_MODEL_DIR, rebuild: bool = False) -> str:
+    """
+    Buat fixture tokenizer + model XLM-RoBERTa kecil (random init, seed tetap)
+    di `path`, tanpa akses jaringan. Tokenizer dilatih dari corpus sintetis
+    dengan special token, pre-tokenizer Metaspace (▁) dan template yang sama
+    seperti XLM-R. Dipakai BPE, bukan Unigram: trainer Unigram pada corpus
+    sekecil ini memecah kata jadi karakter, jadi panjang sequence tidak realistis.
+    """
+    if os.path.isfile(os.path.join(path, "config.json")) and not rebuild:
+        return path
+
+    import torch
+    from tokenizers import (
+        Tokenizer, decoders, models, normalizers, pre_tokenizers, processors, trainers
+    )
+    from transformers import PreTrainedTokenizerFast, XLMRobertaConfig, XLMRobertaForSequenceClassification
+
+    special = ["<s>", "<pad>", "</s>", "<unk>", "<mask>"]  # urutan id sama dengan XLM-R
+    tok = Tokenizer(models.BPE(unk_token="<unk>"))
+    tok.normalizer = normalizers.NFKC()
+    tok.pre_tokenizer = pre_tokenizers.Metaspace()
+    tok.decoder = decoders.Metaspace()
+    trainer = trainers.BpeTrainer(vocab_size=TINY_VOCAB_SIZE, special_tokens=special)
+    tok.train_from_iterator(bench_corpus(20000, seed=SEED + 1), trainer=trainer)
+    tok.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>",
+        pair="<s> $A </s> </s> $B </s>",
+        special_tokens=[(t, tok.token_to_id(t)) for t in ("<s>", "</s>")],
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tok,
+        bos_token="<s>", eos_token="</s>", sep_token="</s>", cls_token="<s>",
+        unk_token="<unk>", pad_token="<pad>", mask_token="<mask>",
+        model_max_length=512,
+    )
+
+    torch.manual_seed(SEED)
+    config = XLMRobertaConfig(
+        vocab_size=tok.get_vocab_size(),
+        pad_token_id=tok.token_to_id("<pad>"),
+        bos_token_id=tok.token_to_id("<s>"),
+        eos_token_id=tok.token_to_id("</s>"),
+        **TINY_CONFIG,
+    )
+    model = XLMRobertaForSequenceClassification(config)
+    tokenizer.save_pretrained(path)
+    model.save_pretrained(path, safe_serialization=True)
+    return path
+
+
+STAGES = ("clean", "tokenize", "forward", "postprocess")
+
+
+def _stage_seconds() -> Dict[str, float]:
+    return {key[0]: total for key, (total, _) in INFERENCE_STAGE_SECONDS.totals().items()}
+
+
+def run_stages(
+    analyzer, texts: List[str], batch_size: int, max_tokens: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Satu pass penuh lewat SentimentAnalyzer.predict_batch (jalur yang sama
+    dengan /analyze). Durasi per stage (ms) diambil dari selisih histogram
+    inference_stage_seconds sebelum & sesudah pass, bukan diukur ulang di sini.
+    """
+    before = _stage_seconds()
+    start = time.perf_counter()
+    analyzer.predict_batch(texts, batch_size=batch_size, max_tokens=max_tokens)
+    total_ms = (time.perf_counter() - start) * 1000
+    after = _stage_seconds()
+    timings = {
+        f"{stage}_ms": (after.get(stage, 0.0) - before.get(stage, 0.0)) * 1000 for stage in STAGES
+    }
+    timings["total_ms"] = total_ms
+    return timings
+
+
+def run_benchmark(
+    analyzer,
+    texts: List[str],
+    batch_sizes: List[int],
+    thread_counts: List[int],
+    repeats: int = 3,
+    max_tokens: Optional[int] = None,
+) -> List[Dict]:
+    """Median tiap stage dari `repeats` pass untuk setiap kombinasi threads x batch size."""
+    import torch
+
+    # tanpa cache: pass berikutnya harus benar-benar menjalankan model lagi
+    analyzer.cache = None
+    results = []
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        for batch_size in batch_sizes:
+            run_stages(analyzer, texts[: batch_size * 2], batch_size, max_tokens)  # warmup
+            runs = [run_stages(analyzer, texts, batch_size, max_tokens) for _ in range(repeats)]
+            row = {"threads": threads, "batch_size": batch_size}
+            for stage in runs[0]:
+                row[stage] = round(statistics.median(r[stage] for r in runs), 3)
+            row["texts_per_sec"] = round(len(texts) / (row["total_ms"] / 1000), 1)
+            # porsi token padding pada rencana batch yang sama (tanpa forward pass)
+            row["padding_waste"] = round(
+                analyzer.measure_padding(texts, batch_size, max_tokens)["padding_waste"], 4
+            )
+            results.append(row)
+            print(
+                f"threads={threads:<2} batch={batch_size:<4} "
+                + " ".join(f"{s}={row[s + '_ms']:.1f}ms" for s in STAGES)
+                + f"  total={row['total_ms']:.1f}ms  {row['texts_per_sec']:.0f} teks/detik"
+                + f"  padding={row['padding_waste']:.1%}"
+            )
+    return results
+
+
+def environment_info() -> Dict:
+    import torch
+    import transformers
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+    }
+
+
+def compare(
+    current: Dict, baseline: Dict, tolerance: float = 0.10, min_delta_ms: float = 5.0
+) -> List[str]:
+    """
+    Bandingkan hasil dengan baseline per (threads, batch_size, stage). Return
+    daftar regresi: stage yang lebih lambat dari baseline lebih dari `tolerance`
+    dan lebih dari `min_delta_ms` (stage beberapa ms saja gampang naik-turun 40%).
+    """
+    base = {(r["threads"], r["batch_size"]): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        ref = base.get((row["threads"], row["batch_size"]))
+        if ref is None:
+            continue
+        for stage in ("clean_ms", "tokenize_ms", "forward_ms", "postprocess_ms", "total_ms"):
+            if not ref.get(stage):
+                continue
+            change = row[stage] / ref[stage] - 1
+            regressed = change > tolerance and row[stage] - ref[stage] > min_delta_ms
+            flag = "❌" if regressed else "  "
+            print(
+                f"{flag} threads={row['threads']:<2} batch={row['batch_size']:<4} "
+                f"{stage:<15} {ref[stage]:>10.1f} -> {row[stage]:>10.1f} ms ({change:+.1%})"
+            )
+            if regressed:
+                regressions.append(f"threads={row['threads']} batch={row['batch_size']} {stage} {change:+.1%}")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend (offline, tanpa download model):
+    #   python -m services.benchmark --out bench_baseline.json
+    #   python -m services.benchmark --compare bench_baseline.json
+    parser = argparse.ArgumentParser(description="Benchmark stage inference dengan model kecil offline")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 8, 32, 64])
+    parser.add_argument(
+        "--threads", type=_int_list, default=sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--max-tokens", type=int, default=None, help="batching per token budget (_probs_bucketed)"
+    )
+    parser.add_argument("--out", default=None, help="simpan hasil sebagai JSON (baseline)")
+    parser.add_argument("--compare", default=None, help="JSON baseline untuk cek regresi")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--min-delta-ms", type=float, default=5.0)
+    parser.add_argument("--rebuild-model", action="store_true")
+    args = parser.parse_args()
+
+    from services.sentiment import SentimentAnalyzer
+
+    model_path = build_tiny_model(rebuild=args.rebuild_model)
+    analyzer = SentimentAnalyzer(TINY_MODEL_NAME, device="cpu", model_path=model_path)
+    texts = bench_corpus(args.texts)
+    report = {
+        "meta": {
+            **environment_info(),
+            "model": TINY_MODEL_NAME,
+            "model_config": TINY_CONFIG,
+            "n_texts": len(texts),
+            "repeats": args.repeats,
+            "max_tokens": args.max_tokens,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run_benchmark(
+            analyzer, texts, args.batch_sizes, args.threads, args.repeats, args.max_tokens
+        ),
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"💾 Baseline disimpan di {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"❌ {len(regressions)} regresi > {args.tolerance:.0%}")
+            sys.exit(1)
+        print("✅ Tidak ada regresi")
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from playwright.async_api import async_playwright
+
+from services.metrics import SCRAPE_STAGE_SECONDS
+from services.scraper import (
+    COOKIES_FILE,
+    LEAN_CHROMIUM_ARGS,
+    LEAN_CONTEXT_OPTIONS,
+    ResourcePolicy,
+    _read_cookies,
+    _close_quietly,
+)
+
+
+class BrowserPool:
+    """
+    Satu Chromium yang hidup selama app berjalan + pool context yang sudah
+    membawa cookies login, supaya tiap /scrape tidak perlu launch browser,
+    parse cookies.json, dan cek login dari nol.
+
+    - cookies.json dibaca sekali (bukan tiap request); setelah login terverifikasi,
+      `storage_state` context itu disimpan dan dipakai untuk context baru
+    - hasil cek login di-cache selama `login_ttl` detik
+    - context di-recycle (ditutup & dibuat ulang) setelah `max_uses` kali pakai
+    - browser di-launch ulang kalau sudah tidak terkoneksi (health check)
+    - kalau `resource_policy` diberikan, browser pakai profil ringan dan tiap
+      context memblokir resource sesuai policy
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        cookies_file: str = COOKIES_FILE,
+        size: int = 2,
+        max_uses: int = 20,
+        login_ttl: float = 600.0,
+        resource_policy: Optional[ResourcePolicy] = None,
+    ):
+        self.headless = headless
+        self.cookies_file = cookies_file
+        self.size = size
+        self.max_uses = max_uses
+        self.login_ttl = login_ttl
+        self.resource_policy = resource_policy
+
+        self._playwright = None
+        self._browser = None
+        self._cookies = None
+        self._storage_state = None
+        self._login_checked_at: Optional[float] = None
+        self._idle: list = []  # [(context, uses)]
+        self._slots = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self.launches = 0
+        self.contexts_created = 0
+
+    # ---------- lifecycle ----------
+    async def start(self):
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def stop(self):
+        async with self._lock:
+            for context, _ in self._idle:
+                await _close_quietly(context)
+            self._idle.clear()
+            await _close_quietly(self._browser)
+            self._browser = None
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+
+    def healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        if self.healthy():
+            return
+        if self._browser is not None:
+            print("⚠️ [POOL] Browser terputus, launch ulang")
+            self._idle.clear()
+            await _close_quietly(self._browser)
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        with SCRAPE_STAGE_SECONDS.time(stage="browser_launch"):
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=LEAN_CHROMIUM_ARGS if self.resource_policy else None,
+            )
+        self.launches += 1
+
+    # ---------- login cache ----------
+    @property
+    def login_verified(self) -> bool:
+        return (
+            self._login_checked_at is not None
+            and time.monotonic() - self._login_checked_at < self.login_ttl
+        )
+
+    async def remember_login(self, context):
+        """Simpan storage_state dari context yang sudah terbukti logged-in."""
+        self._storage_state = await context.storage_state()
+        self._login_checked_at = time.monotonic()
+
+    def invalidate_login(self):
+        # baca ulang cookies.json di context berikutnya (mungkin sudah di-update)
+        self._cookies = None
+        self._storage_state = None
+        self._login_checked_at = None
+
+    # ---------- contexts ----------
+    async def _new_context(self):
+        options = dict(LEAN_CONTEXT_OPTIONS) if self.resource_policy else {}
+        if self._storage_state is not None:
+            context = await self._browser.new_context(
+                storage_state=self._storage_state, **options
+            )
+        else:
+            context = await self._browser.new_context(**options)
+            if self._cookies is None:
+                try:
+                    self._cookies = _read_cookies(self.cookies_file)
+                except Exception as e:
+                    print(f"🔴[WARNING] gagal load cookies: {e}")
+                    self._cookies = []
+            if self._cookies:
+                await context.add_cookies(self._cookies)
+        if self.resource_policy is not None:
+            await self.resource_policy.install(context)
+        self.contexts_created += 1
+        return context
+
+    @asynccontextmanager
+    async def context(self):
+        """Pinjam satu context (maks `size` bersamaan); dikembalikan ke pool setelah dipakai."""
+        async with self._slots:
+            async with self._lock:
+                await self._ensure_browser()
+                if self._idle:
+                    context, uses = self._idle.pop()
+                else:
+                    context, uses = await self._new_context(), 0
+
+            ok = False
+            try:
+                yield context
+                ok = True
+            finally:
+                uses += 1
+                # tutup page sisa supaya context bersih untuk peminjam berikutnya
+                for page in list(context.pages):
+                    await _close_quietly(page)
+                if ok and uses < self.max_uses and self.healthy():
+                    self._idle.append((context, uses))
+                else:
+                    await _close_quietly(context)
+
+    def stats(self) -> dict:
+        return {
+            "healthy": self.healthy(),
+            "size": self.size,
+            "idle_contexts": len(self._idle),
+            "launches": self.launches,
+            "contexts_created": self.contexts_created,
+            "login_verified": self.login_verified,
+            "blocked_requests": self.resource_policy.blocked if self.resource_policy else 0,
+        }
+
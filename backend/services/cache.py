@@ -0,0 +1,107 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class PredictionCache:
+    """
+    Cache probabilitas sentimen per (model, cleaned_text).
+
+    Dua tingkat:
+      - LRU in-memory (`max_entries`)
+      - opsional SQLite (`db_path`) supaya hasil tetap ada setelah restart
+
+    Key adalah hash dari nama model + teks yang sudah dibersihkan, jadi retweet /
+    tweet promo copy-paste cukup dihitung sekali.
+    """
+
+    def __init__(
+        self, model_name: str, max_entries: int = 10000, db_path: Optional[str] = None
+    ):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, probs TEXT)"
+            )
+            self._db.commit()
+
+    def key(self, cleaned_text: str) -> str:
+        raw = f"{self.model_name}\x00{cleaned_text}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _remember(self, key: str, probs: List[float]):
+        self._lru[key] = probs
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Return {text: probs} untuk teks yang sudah ada di cache."""
+        found = {}
+        with self._lock:
+            missing = {}
+            for text in texts:
+                key = self.key(text)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[text] = self._lru[key]
+                else:
+                    missing[key] = text
+            self.hits += len(found)
+
+            if missing and self._db is not None:
+                keys = list(missing)
+                # batasi jumlah parameter per query (limit SQLite 999 di versi lama)
+                for i in range(0, len(keys), 500):
+                    part = keys[i : i + 500]
+                    rows = self._db.execute(
+                        "SELECT key, probs FROM predictions WHERE key IN (%s)"
+                        % ",".join("?" * len(part)),
+                        part,
+                    ).fetchall()
+                    for key, probs in rows:
+                        probs = json.loads(probs)
+                        self._remember(key, probs)
+                        found[missing.pop(key)] = probs
+                        self.disk_hits += 1
+
+            self.misses += len(missing)
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        with self._lock:
+            rows = []
+            for text, probs in items.items():
+                key = self.key(text)
+                probs = [float(p) for p in probs]
+                self._remember(key, probs)
+                rows.append((key, json.dumps(probs)))
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, probs) VALUES (?, ?)", rows
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
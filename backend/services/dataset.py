@@ -0,0 +1,195 @@
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+DATASET_DIR = "dataset"
+BUFFER_ROWS = 1000
+MAX_FILE_BYTES = 64 * 1024 * 1024
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("Dataset Parquet butuh pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def query_slug(search_query: str) -> str:
+    """Ubah query jadi nama folder, mis. "Samsung Galaxy" -> samsung_galaxy."""
+    return re.sub(r"[^\w]+", "_", search_query.strip().lower()).strip("_") or "query"
+
+
+def _schema():
+    pa = _require_pyarrow()
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("text", pa.string()),
+            ("author", pa.string()),
+            ("scraped_at", pa.timestamp("us")),
+        ]
+    )
+
+
+def _to_table(rows: List[Dict], scraped_at: datetime):
+    pa = _require_pyarrow()
+    # timestamp tanpa zona (mode dom, datetime.now()) dianggap UTC; disimpan UTC naive
+    ts = pd.to_datetime(
+        [r.get("timestamp") for r in rows], utc=True, errors="coerce", format="ISO8601"
+    ).tz_convert(None)
+    return pa.table(
+        {
+            "id": [r.get("id") for r in rows],
+            "timestamp": pa.array(ts.to_numpy(), type=pa.timestamp("us"), from_pandas=True),
+            "text": [r.get("text") for r in rows],
+            "author": [r.get("author") for r in rows],
+            "scraped_at": pa.array([scraped_at] * len(rows), type=pa.timestamp("us")),
+        },
+        schema=_schema(),
+    )
+
+
+class DatasetWriter:
+    """
+    Pengganti append CSV per 10 baris: baris di-buffer lalu ditulis sebagai
+    Parquet terkompresi, dipartisi per query dan tanggal tweet:
+
+        <root>/query=<slug>/date=YYYY-MM-DD/part-<run>-<n>.parquet
+
+    Tiap flush jadi satu row group di file yang sedang terbuka; file baru dibuka
+    kalau ukurannya sudah >= `max_file_bytes`. File yang masih ditulis diberi
+    prefix "." supaya tidak ikut terbaca sebelum footer-nya lengkap.
+    """
+
+    def __init__(
+        self,
+        search_query: str,
+        root: str = DATASET_DIR,
+        buffer_rows: int = BUFFER_ROWS,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        compression: str = "zstd",
+    ):
+        _require_pyarrow()
+        self.root = root
+        self.query = query_slug(search_query)
+        self.buffer_rows = buffer_rows
+        self.max_file_bytes = max_file_bytes
+        self.compression = compression
+        self.run_id = uuid.uuid4().hex[:8]
+        self.rows_written = 0
+        self.files_written: List[str] = []
+        self._buffer: List[Dict] = []
+        self._open: Dict[str, tuple] = {}  # date -> (writer, tmp_path, final_path)
+        self._parts = 0
+
+    def buffer(self, row: Dict) -> Optional[List[Dict]]:
+        """
+        Tambah `row` ke buffer tanpa IO. Kalau buffer penuh, isinya dikeluarkan
+        dan dikembalikan supaya pemanggil async bisa `write` di thread lain.
+        """
+        self._buffer.append(row)
+        if len(self._buffer) < self.buffer_rows:
+            return None
+        rows, self._buffer = self._buffer, []
+        return rows
+
+    def add(self, row: Dict):
+        rows = self.buffer(row)
+        if rows:
+            self.write(rows)
+
+    def extend(self, rows: List[Dict]):
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        rows, self._buffer = self._buffer, []
+        self.write(rows)
+
+    def write(self, rows: List[Dict]):
+        """Tulis `rows` ke file Parquet partisinya (blocking IO; tidak menyentuh buffer)."""
+        if not rows:
+            return
+        pa = _require_pyarrow()
+        table = _to_table(rows, datetime.now())
+
+        dates = pd.Series(table.column("timestamp").to_pandas()).dt.strftime("%Y-%m-%d")
+        dates = dates.fillna("unknown")
+        for date in dates.unique():
+            part = table.filter(pa.array((dates == date).to_numpy()))
+            writer, tmp_path, final_path = self._writer_for(date)
+            writer.write_table(part)
+            self.rows_written += part.num_rows
+            if os.path.getsize(tmp_path) >= self.max_file_bytes:
+                self._close_file(date)
+
+    def _writer_for(self, date: str):
+        if date not in self._open:
+            import pyarrow.parquet as pq
+
+            folder = os.path.join(self.root, f"query={self.query}", f"date={date}")
+            os.makedirs(folder, exist_ok=True)
+            self._parts += 1
+            name = f"part-{self.run_id}-{self._parts:04d}.parquet"
+            tmp_path = os.path.join(folder, "." + name)
+            writer = pq.ParquetWriter(tmp_path, _schema(), compression=self.compression)
+            self._open[date] = (writer, tmp_path, os.path.join(folder, name))
+        return self._open[date]
+
+    def _close_file(self, date: str):
+        writer, tmp_path, final_path = self._open.pop(date)
+        writer.close()
+        os.replace(tmp_path, final_path)
+        self.files_written.append(final_path)
+
+    def close(self):
+        self.flush()
+        for date in list(self._open):
+            self._close_file(date)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_dataset(
+    root: str = DATASET_DIR,
+    columns: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Baca dataset Parquet. Hanya kolom di `columns` yang dibaca, dan partisi
+    query/tanggal di luar filter tidak disentuh sama sekali.
+
+    Tanggal dalam format "YYYY-MM-DD" (inklusif). Kolom partisi `query` dan
+    `date` bisa ikut diminta lewat `columns`.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as pads
+
+    partitioning = pads.partitioning(
+        pa.schema([("query", pa.string()), ("date", pa.string())]), flavor="hive"
+    )
+    dataset = pads.dataset(root, format="parquet", partitioning=partitioning)
+
+    filt = None
+    conditions = []
+    if query is not None:
+        conditions.append(pads.field("query") == query_slug(query))
+    if start_date is not None:
+        conditions.append(pads.field("date") >= start_date)
+    if end_date is not None:
+        conditions.append(pads.field("date") <= end_date)
+    for cond in conditions:
+        filt = cond if filt is None else filt & cond
+    return dataset.to_table(columns=columns, filter=filt).to_pandas()
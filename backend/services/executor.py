@@ -0,0 +1,32 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+def _set_torch_threads(torch_threads: int):
+    # import di sini supaya membuat executor tidak ikut memuat torch saat startup
+    import torch
+
+    torch.set_num_threads(torch_threads)
+
+
+def create_inference_executor(
+    workers: int = 1, torch_threads: Optional[int] = None
+) -> ThreadPoolExecutor:
+    """
+    Thread pool khusus untuk forward pass model, terpisah dari default executor
+    asyncio dan dari event loop yang dipakai Playwright.
+
+    `torch_threads` membatasi intra-op thread PyTorch (berlaku global per proses)
+    supaya inference tidak memakan semua core dan scraping/health check tetap
+    dapat jatah CPU. Default: sisakan satu core untuk event loop. Diset saat
+    thread pertama pool dibuat, sebelum job pertama jalan.
+    """
+    if torch_threads is None:
+        torch_threads = max(1, (os.cpu_count() or 2) - 1) // max(1, workers) or 1
+    return ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="inference",
+        initializer=_set_torch_threads,
+        initargs=(torch_threads,),
+    )
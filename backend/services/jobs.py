@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class Job:
+    """
+    Satu pekerjaan di `JobQueue`. Runner mengisi `results` sedikit demi
+    sedikit (`extend`) dan memperbarui `progress`, jadi hasil parsial sudah
+    bisa diambil selama job masih jalan.
+    """
+
+    def __init__(self, kind: str, params: Dict[str, Any], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.progress: Dict[str, Any] = {}
+        self.results: List[Dict] = []
+        self.meta: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def extend(self, rows: List[Dict]):
+        self.results.extend(rows)
+
+    def update_progress(self, **progress):
+        self.progress.update(progress)
+
+    def info(self) -> Dict[str, Any]:
+        """Status tanpa isi hasil (hasil diambil per halaman lewat `page`)."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.progress,
+            "count": len(self.results),
+            "meta": self.meta,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def page(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        offset = max(0, offset)
+        rows = self.results[offset : offset + max(0, limit)]
+        next_offset = offset + len(rows)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "offset": offset,
+            "count": len(rows),
+            "total": len(self.results),
+            "next_offset": next_offset if next_offset < len(self.results) or not self.finished else None,
+            "results": rows,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.info(), "results": list(self.results)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        job = cls(data["kind"], data.get("params", {}), job_id=data["job_id"])
+        for key in ("status", "progress", "meta", "error", "created_at", "started_at", "finished_at"):
+            setattr(job, key, data.get(key, getattr(job, key)))
+        job.results = data.get("results", [])
+        return job
+
+
+Runner = Callable[[Job], Awaitable[None]]
+
+
+class JobQueue:
+    """
+    Antrean job di background untuk pekerjaan yang lebih lama dari umur satu
+    request HTTP (scrape dengan Playwright, analisis ribuan teks). `submit`
+    langsung mengembalikan job; paling banyak `workers` job jalan bersamaan,
+    sisanya menunggu di antrean (maks `max_queued`, lebih dari itu ditolak).
+
+    Job yang sudah selesai disimpan di memori (maks `max_jobs`, yang paling
+    lama dibuang duluan). Kalau `root` diisi, job yang selesai juga ditulis
+    ke `<root>/<job_id>.json` supaya hasilnya tetap bisa diambil setelah
+    dibuang dari memori atau setelah restart.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 100,
+        max_jobs: int = 200,
+        root: Optional[str] = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.max_jobs = max_jobs
+        self.root = root
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._runners: Dict[str, Runner] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._saves: set = set()
+        self._stopping = False
+        # job yang masih menunggu worker; job antre yang dibatalkan tetap ada di
+        # self._queue sampai diambil worker, jadi qsize() tidak dipakai untuk batas antrean
+        self._queued = 0
+
+    async def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        self._stopping = True
+        for job in list(self._jobs.values()):
+            if job._task is not None:
+                job._task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*self._saves, return_exceptions=True)
+
+    def submit(self, kind: str, params: Dict[str, Any], runner: Runner) -> Job:
+        """Antrikan `runner(job)`; ValueError kalau antrean sudah penuh."""
+        if self._queued >= self.max_queued:
+            raise ValueError(f"Antrean job penuh ({self.max_queued}), coba lagi nanti")
+        job = Job(kind, params)
+        self._jobs[job.id] = job
+        self._runners[job.id] = runner
+        self._queue.put_nowait(job)
+        self._queued += 1
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._load(job_id)
+        return job
+
+    def list(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            job.info() for job in reversed(self._jobs.values())
+            if status is None or job.status == status
+        ]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Batalkan job yang masih antre/jalan; hasil parsial tetap disimpan."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            # belum diambil worker: worker akan melewatinya
+            self._queued -= 1
+            self._finish(job, "cancelled")
+        return job
+
+    def delete(self, job_id: str) -> bool:
+        """Hapus job yang sudah selesai dari memori dan disk."""
+        job = self.get(job_id)
+        if job is None or not job.finished:
+            return False
+        self._jobs.pop(job_id, None)
+        path = self._path(job_id)
+        if path and os.path.exists(path):
+            os.remove(path)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {state: 0 for state in JOB_STATES}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"workers": self.workers, "queued": self._queued, "jobs": counts}
+
+    # ---------- worker ----------
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            runner = self._runners.pop(job.id, None)
+            if job.status != "queued" or runner is None:
+                continue
+            self._queued -= 1
+            job.status, job.started_at = "running", time.time()
+            job._task = asyncio.create_task(runner(job))
+            try:
+                await job._task
+                self._finish(job, "done")
+            except asyncio.CancelledError:
+                self._finish(job, "cancelled")
+                # worker sendiri yang dibatalkan (stop), bukan hanya job-nya
+                if self._stopping:
+                    raise
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                self._finish(job, "failed")
+            finally:
+                job._task = None
+
+    def _finish(self, job: Job, status: str):
+        job.status, job.finished_at = status, time.time()
+        self._runners.pop(job.id, None)
+        if self.root:
+            # json.dump seluruh hasil bisa lama; tulis di thread, bukan di event loop
+            task = asyncio.create_task(asyncio.to_thread(self._save, job.id, job.to_dict()))
+            self._saves.add(task)
+            task.add_done_callback(self._saves.discard)
+        self._evict()
+
+    def _evict(self):
+        # buang job selesai yang paling lama; job yang masih antre/jalan tidak dihitung dibuang
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+    # ---------- persistence ----------
+    def _path(self, job_id: str) -> Optional[str]:
+        if not self.root or not job_id.isalnum():
+            return None
+        return os.path.join(self.root, f"{job_id}.json")
+
+    def _save(self, job_id: str, data: Dict[str, Any]):
+        path = self._path(job_id)
+        if not path:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        path = self._path(job_id)
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as fh:
+            return Job.from_dict(json.load(fh))
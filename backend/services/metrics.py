@@ -0,0 +1,202 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Metrik in-process dengan format teks Prometheus (GET /metrics), tanpa
+# dependency prometheus_client. Aman dipakai dari thread inference maupun
+# event loop. Catatan: worker ShardedInferenceEngine (proses lain) tidak ikut.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+_registry: List["_Metric"] = []
+
+
+def _escape_label_value(value) -> str:
+    # escaping sesuai format teks Prometheus: backslash, kutip ganda, newline
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[n] for n in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Nilai sesaat; `set_function` untuk nilai yang dibaca saat /metrics dipanggil (mis. panjang antrean)."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple, List] = {}  # key -> [counts per bucket, sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Ukur durasi blok `with` dalam detik (tetap tercatat kalau blok error)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def totals(self) -> Dict[Tuple, Tuple[float, int]]:
+        """(sum, count) per label set; selisih dua snapshot = durasi di antaranya."""
+        with self._lock:
+            return {k: (s[1], s[2]) for k, s in self._series.items()}
+
+    def _samples(self):
+        with self._lock:
+            items = [(k, list(s[0]), s[1], s[2]) for k, s in self._series.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for upper, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(upper)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Semua metrik dalam format teks Prometheus (content type text/plain; version=0.0.4)."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# =========================
+# METRIK APLIKASI
+# =========================
+INFERENCE_STAGE_SECONDS = Histogram(
+    "inference_stage_seconds",
+    "Durasi stage inference: clean, tokenize, forward, postprocess",
+    ["stage"],
+)
+MODEL_BATCH_SIZE = Histogram(
+    "inference_model_batch_size", "Jumlah teks per forward pass model", buckets=SIZE_BUCKETS
+)
+ANALYZE_BATCH_SIZE = Histogram(
+    "analyze_batch_size", "Jumlah teks per batch gabungan InferenceBatcher", buckets=SIZE_BUCKETS
+)
+ANALYZE_QUEUE_DEPTH = Gauge(
+    "analyze_queue_depth", "Request /analyze yang menunggu di antrean batcher"
+)
+ANALYZE_INFLIGHT_BATCHES = Gauge(
+    "analyze_inflight_batches", "Batch yang sedang dijalankan di executor inference"
+)
+SCRAPE_STAGE_SECONDS = Histogram(
+    "scrape_stage_seconds",
+    "Durasi stage scraping: browser_launch, context, goto, page_ready, extract, scroll_wait",
+    ["stage"],
+)
+SCRAPE_TWEETS_PER_SCROLL = Histogram(
+    "scrape_tweets_per_scroll", "Tweet baru per scroll", buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+SCRAPE_TWEETS = Counter("scrape_tweets_total", "Tweet baru yang diambil scraper", ["mode"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Durasi request HTTP per endpoint", ["method", "path", "status"]
+)
+
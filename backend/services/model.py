@@ -1,8 +1,9 @@
-import re
 import pandas as pd
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
+from services.normalize import get_normalizer
+
 class SentimentAnalyzer:
     def __init__(self, model_name="cardiffnlp/twitter-xlm-roberta-base-sentiment"):
         self.labels = ["Negative", "Neutral", "Positive"]
@@ -10,12 +11,8 @@ class SentimentAnalyzer:
         self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
 
     def clean_text(self, text: str) -> str:
-        """Cleaning sederhana untuk tweet"""
-        text = re.sub(r"http\S+", "", text)   # remove urls
-        text = re.sub(r"@\w+", "@user", text) # replace mentions
-        text = re.sub(r"#\w+", "", text)      # remove hashtags
-        text = re.sub(r"\s+", " ", text)      # remove extra spaces
-        return text.strip()
+        """Cleaning sederhana untuk tweet (URL dibuang, mention -> @user, hashtag dibuang)"""
+        return get_normalizer(keep_hashtag_text=False)(text)
 
     def predict(self, text: str) -> dict:
         """Prediksi sentimen untuk satu teks"""
@@ -0,0 +1,99 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional
+
+LOAD_MODES = ("background", "lazy", "eager")
+
+
+class ModelLoader:
+    """
+    Bungkus pembuatan `SentimentAnalyzer` supaya tidak terjadi saat import
+    modul. Mode:
+
+    - "background": load dimulai saat startup di `executor`, app langsung
+      bisa melayani `/` dan `/ready` (default)
+    - "lazy": load baru dimulai saat model pertama kali dibutuhkan
+    - "eager": startup menunggu sampai model siap (perilaku lama)
+
+    `factory` dijalankan sekali; setelah itu `warmup()` milik objeknya
+    (kalau ada) dipanggil. Durasi tiap fase dikumpulkan di `timings`.
+    Kalau load gagal, state jadi "failed" dan panggilan berikutnya mencoba lagi.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        mode: str = "background",
+        executor: Optional[Executor] = None,
+        warmup: bool = True,
+    ):
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode: {mode!r} (expected one of {LOAD_MODES})")
+        self.factory = factory
+        self.mode = mode
+        self.executor = executor
+        self.warmup = warmup
+        self.state = "idle"
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self._value = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Future] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def get(self):
+        """Ambil objeknya; blocking (load di thread ini kalau belum). Untuk thread executor."""
+        if self._value is not None:
+            return self._value
+        with self._lock:
+            if self._value is not None:
+                return self._value
+            self.state, self.error = "loading", None
+            started = time.perf_counter()
+            try:
+                value = self.factory()
+                self.timings.update(getattr(value, "load_timings", {}))
+                if self.warmup and hasattr(value, "warmup"):
+                    self.timings["warmup"] = value.warmup()
+            except Exception as e:
+                self.state, self.error = "failed", str(e)
+                raise
+            self.timings["total"] = time.perf_counter() - started
+            self._value, self.state = value, "ready"
+            return value
+
+    async def start(self):
+        """Mulai load sesuai mode; "eager" menunggu selesai, "lazy" tidak melakukan apa-apa."""
+        if self.mode == "lazy":
+            return
+        self._schedule()
+        if self.mode == "eager":
+            await self.wait()
+
+    def _schedule(self):
+        if self._task is None or (self._task.done() and self.state == "failed"):
+            loop = asyncio.get_running_loop()
+            self._task = loop.run_in_executor(self.executor, self.get)
+            # error sudah dicatat di state/error; jangan jadi "exception never retrieved"
+            self._task.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def wait(self, timeout: Optional[float] = None):
+        """Tunggu sampai siap (memulai load kalau belum); error load dilempar ulang."""
+        if self._value is not None:
+            return self._value
+        self._schedule()
+        return await asyncio.wait_for(asyncio.shield(self._task), timeout)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "mode": self.mode,
+            "error": self.error,
+            "timings": {k: round(v, 3) for k, v in self.timings.items()},
+        }
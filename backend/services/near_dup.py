@@ -0,0 +1,168 @@
+import re
+import sys
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.normalize import get_normalizer
+
+NUM_PERM = 64
+TOKEN_PATTERN = re.compile(r"\w+")
+# token yang tidak membedakan isi tweet (penanda retweet, sisa mention)
+IGNORED_TOKENS = frozenset({"rt", "via"})
+
+# URL & mention dibuang, huruf kecil: retweet dengan @mention/link lain jadi teks yang sama
+_fingerprint_normalizer = get_normalizer(replace_mentions_with_tag=False, lower=True)
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def fingerprint_tokens(text: str) -> List[str]:
+    cleaned = _fingerprint_normalizer(text)
+    return [t for t in TOKEN_PATTERN.findall(cleaned) if t not in IGNORED_TOKENS]
+
+
+_rng = np.random.default_rng(20240601)  # seed tetap: signature stabil antar proses/run
+# multiply-shift hashing (overflow uint64 memang disengaja): satu (a, b) per permutasi
+_PERM_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+
+def minhash(text: str, min_tokens: int = 4) -> Optional[np.ndarray]:
+    """
+    Signature MinHash (NUM_PERM nilai) dari shingle 2 kata pada teks yang sudah
+    dinormalisasi. None untuk teks yang terlalu pendek (< `min_tokens` token);
+    teks pendek hanya dicocokkan persis, karena 1 kata beda sudah mengubah artinya.
+    """
+    tokens = fingerprint_tokens(text)
+    if len(tokens) < min_tokens:
+        return None
+    shingles = {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    hashes = np.fromiter((_hash64(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _PERM_A + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0)
+
+
+class NearDuplicateIndex:
+    """
+    Index MinHash + LSH: signature dipecah jadi band berisi `rows_per_band`
+    nilai; teks yang punya minimal satu band sama jadi kandidat, lalu
+    dianggap duplikat kalau estimasi Jaccard shingle-nya >= `threshold`.
+    Dengan default (21 band x 3 baris), pasangan dengan Jaccard 0.5 jadi
+    kandidat ~94% dan Jaccard 0.2 hanya ~16%.
+
+    Threshold default 0.9 sengaja ketat: tweet yang beda satu kata ("bagus"
+    vs "jelek") sudah ada di Jaccard ~0.7, dan menggabungkannya berarti
+    membuang opini yang berlawanan.
+
+    Tiap cluster diwakili teks pertama yang masuk; `add` mengembalikan id
+    cluster (urutan representative) dan apakah teks itu duplikat.
+    """
+
+    def __init__(self, threshold: float = 0.9, rows_per_band: int = 3, min_tokens: int = 4):
+        self.threshold = threshold
+        self.rows_per_band = rows_per_band
+        self.min_tokens = min_tokens
+        self._n_bands = NUM_PERM // rows_per_band
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self._n_bands)]
+        self._exact: Dict[str, int] = {}  # teks pendek ternormalisasi -> cluster
+        self._signatures: List[Optional[np.ndarray]] = []
+        self.seen = 0
+        self.duplicates = 0
+
+    def _band_keys(self, signature: np.ndarray):
+        r = self.rows_per_band
+        for i in range(self._n_bands):
+            yield signature[i * r : (i + 1) * r].tobytes()
+
+    def _find(self, signature: np.ndarray) -> Optional[int]:
+        checked = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            for cluster in buckets.get(key, ()):
+                if cluster in checked:
+                    continue
+                checked.add(cluster)
+                if (self._signatures[cluster] == signature).mean() >= self.threshold:
+                    return cluster
+        return None
+
+    def add(self, text: str) -> Tuple[int, bool]:
+        self.seen += 1
+        signature = minhash(text, self.min_tokens)
+        if signature is None:
+            key = " ".join(fingerprint_tokens(text))
+            cluster = self._exact.get(key)
+        else:
+            cluster = self._find(signature)
+        if cluster is not None:
+            self.duplicates += 1
+            return cluster, True
+
+        cluster = len(self._signatures)
+        self._signatures.append(signature)
+        if signature is None:
+            # fingerprint kosong (emoji/URL/mention saja): isinya tidak terbaca di
+            # fingerprint, jadi jangan pernah digabung - tiap teks cluster sendiri
+            if key:
+                self._exact[key] = cluster
+        else:
+            for buckets, band in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(band, []).append(cluster)
+        return cluster, False
+
+    def stats(self) -> dict:
+        return {
+            "seen": self.seen,
+            "clusters": len(self._signatures),
+            "duplicates": self.duplicates,
+            "duplicate_ratio": self.duplicates / self.seen if self.seen else 0.0,
+        }
+
+
+def cluster_texts(texts: List[str], threshold: float = 0.9) -> List[int]:
+    """Untuk tiap teks, index teks representative cluster-nya (dirinya sendiri kalau bukan duplikat)."""
+    index = NearDuplicateIndex(threshold)
+    first_of: List[int] = []
+    reps = []
+    for i, text in enumerate(texts):
+        cluster, duplicate = index.add(text)
+        if not duplicate:
+            first_of.append(i)
+        reps.append(first_of[cluster])
+    return reps
+
+
+def expand_collapsed(texts: List[str], reps: List[int], scored: Dict[int, Dict]) -> List[Dict]:
+    """
+    Bentuk satu baris per teks dari hasil skor representative (`scored`:
+    index representative -> baris hasil). Baris anggota memakai label &
+    probabilitas representative-nya, tapi tetap membawa `text`/`cleaned_text`
+    miliknya sendiri dan ditandai `near_duplicate=True`.
+    """
+    results = []
+    for i, rep in enumerate(reps):
+        if rep == i:
+            results.append({**scored[i], "near_duplicate": False})
+        else:
+            row = dict(scored[rep])
+            row["text"] = texts[i]
+            row["cleaned_text"] = get_normalizer()(texts[i])
+            row["near_duplicate"] = True
+            results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    # cek cepat dari folder backend: python -m services.near_dup "teks 1" "teks 2" ...
+    texts = sys.argv[1:] or [
+        "RT @budi: Promo HP Samsung Galaxy murah banget hari ini https://t.co/abc",
+        "@ani Promo HP Samsung Galaxy murah banget hari ini https://t.co/xyz",
+        "Promo HP Samsung Galaxy murah banget hari ini!!",
+        "Baterai HP ini cepat habis, kecewa banget sama servisnya",
+    ]
+    for i, rep in enumerate(cluster_texts(texts)):
+        print(f"[{i}] -> cluster {rep}: {texts[i][:70]!r}")
@@ -0,0 +1,247 @@
+import re
+import html
+import time
+from functools import lru_cache, partial
+from multiprocessing import Pool
+from typing import Callable, List, Optional
+
+URL_PATTERN = re.compile(
+    r"(https?://\S+|www\.\S+|(?:\b[\w-]+\.)+[a-zA-Z]{2,})(?=\s|$)",
+    flags=re.IGNORECASE,
+)
+
+# URL_PATTERN tidak pernah cocok melewati whitespace dan selalu berakhir di ujung
+# token, jadi cukup dijalankan pada token yang mengandung '.' atau ':'. Lookbehind
+# membuat pencarian kandidat linear (hanya mulai di awal token).
+URL_CANDIDATE = re.compile(r"(?<!\S)[^\s.:]*[.:]\S*")
+
+MENTION_PATTERN = re.compile(r"@\w+")
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+# "#AI" -> "AI" cukup dengan membuang '#' di depan huruf; tanpa group/template
+HASHTAG_MARK = re.compile(r"#(?=\w)")
+NON_ASCII = re.compile(r"[^\x00-\x7F]+")
+MULTI_WS = re.compile(r"\s+")
+REPEAT_CHARS = re.compile(r"(.)\1{2,}")
+
+# di bawah ini batch diproses di proses utama; overhead Pool lebih mahal dari regex-nya
+PARALLEL_MIN_TEXTS = 20000
+
+
+def make_normalizer(
+    *,
+    keep_hashtag_text: bool = True,
+    replace_mentions_with_tag: bool = True,
+    lower: bool = False,
+    remove_emojis: bool = False,
+) -> Callable[[str], str]:
+    """
+    Bangun fungsi cleaning untuk satu kombinasi opsi (opsi sama dengan
+    `SentimentAnalyzer.clean_text`). Cabang opsi diputuskan sekali di sini, bukan
+    per teks, dan tiap regex dilewati kalau karakter pemicunya tidak ada di teks
+    ('&', '.'/'://', '@', '#'). Regex URL hanya dijalankan pada token kandidat dan
+    whitespace dirapikan dengan split/join. Hasilnya identik dengan langkah aslinya
+    (lihat `check_equivalence`).
+    """
+    unescape = html.unescape
+    url_sub = URL_PATTERN.sub
+    candidate_sub = URL_CANDIDATE.sub
+
+    def strip_urls(match):
+        return url_sub("", match.group())
+
+    mention_sub = MENTION_PATTERN.sub
+    mention_repl = "@user" if replace_mentions_with_tag else ""
+    hashtag_sub = HASHTAG_MARK.sub if keep_hashtag_text else HASHTAG_PATTERN.sub
+    emoji_sub = NON_ASCII.sub
+    repeat_sub = REPEAT_CHARS.sub
+
+    def normalize(text: str) -> str:
+        if not isinstance(text, str):
+            return ""
+        if "&" in text:
+            text = unescape(text)
+        # semua bentuk URL butuh '.' atau '://'
+        if "." in text or "://" in text:
+            text = candidate_sub(strip_urls, text)
+        if "@" in text:
+            text = mention_sub(mention_repl, text)
+        if "#" in text:
+            text = hashtag_sub("", text)
+        if remove_emojis:
+            text = emoji_sub(" ", text)
+        text = repeat_sub(r"\1\1", text)
+        # == MULTI_WS.sub(" ", text).strip(); str.split memakai definisi whitespace yang sama
+        text = " ".join(text.split())
+        if lower:
+            text = text.lower()
+        return text
+
+    return normalize
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(**options) -> Callable[[str], str]:
+    """`make_normalizer` yang di-cache per kombinasi opsi (cuma ada 16)."""
+    return make_normalizer(**options)
+
+
+_default = get_normalizer()
+
+
+def normalize(text: str, **options) -> str:
+    """Bersihkan satu tweet; tanpa opsi pakai normalizer default yang sudah dibuat."""
+    if not options:
+        return _default(text)
+    return get_normalizer(**options)(text)
+
+
+def _normalize_many(texts: List[str], options: dict) -> List[str]:
+    fn = get_normalizer(**options) if options else _default
+    return [fn(t) for t in texts]
+
+
+def normalize_batch(
+    texts: List[str], workers: Optional[int] = None, chunksize: int = 2000, **options
+) -> List[str]:
+    """
+    Bersihkan banyak teks sekaligus (urutan tetap). Dengan `workers` > 1 dan
+    batch besar (>= PARALLEL_MIN_TEXTS), teks dibagi per `chunksize` ke
+    beberapa proses.
+    """
+    if not workers or workers <= 1 or len(texts) < PARALLEL_MIN_TEXTS:
+        return _normalize_many(texts, options)
+    chunks = [texts[i : i + chunksize] for i in range(0, len(texts), chunksize)]
+    with Pool(workers) as pool:
+        parts = pool.map(partial(_normalize_many, options=options), chunks)
+    return [t for part in parts for t in part]
+
+
+# =========================
+# EQUIVALENCE CHECK & MICROBENCHMARK
+# =========================
+def reference_clean_text(
+    text: str,
+    *,
+    keep_hashtag_text: bool = True,
+    replace_mentions_with_tag: bool = True,
+    lower: bool = False,
+    remove_emojis: bool = False,
+) -> str:
+    """Implementasi langkah-demi-langkah lama dari SentimentAnalyzer.clean_text (acuan)."""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    text = URL_PATTERN.sub("", text)
+    if replace_mentions_with_tag:
+        text = MENTION_PATTERN.sub("@user", text)
+    else:
+        text = MENTION_PATTERN.sub("", text)
+    if keep_hashtag_text:
+        text = HASHTAG_PATTERN.sub(r"\1", text)
+    else:
+        text = HASHTAG_PATTERN.sub("", text)
+    if remove_emojis:
+        text = re.sub(r"[^\x00-\x7F]+", " ", text)
+    text = REPEAT_CHARS.sub(r"\1\1", text)
+    text = MULTI_WS.sub(" ", text).strip()
+    if lower:
+        text = text.lower()
+    return text
+
+
+EDGE_CASES = [
+    "",
+    "   ",
+    None,
+    "plain text without anything",
+    "Check https://t.co/abc123 now!!!",
+    "HTTP://EXAMPLE.COM/path?q=1 caps url",
+    "go to www.example.com/page or example.co.id",
+    "http://x no dot url",
+    "mail me at bob@example.com",
+    "@user1 @user_2 hello @@double",
+    "#AI #machine_learning ##double #",
+    "@#tag and #@mention and @bob#tag",
+    "&amp;lt;b&amp;gt; &lt;3 &#64;bob &#35;tag",
+    "sooooo goooood!!!!!! ??? ...",
+    "emoji 😀😀😀 and ñandú café",
+    "newline\nand\ttabs  and   spaces",
+    "\u00a0nbsp\u2003em space\x1cfile sep\u200bzero width\u3000ideographic\r\n",
+    "a-b-c.d-e.fg h_i.jk- l.m",
+    "trailing newline example.com\n",
+    "trailing domain example.com",
+    "domain.com, with comma",
+    "a.b.c.d.e",
+    "Mantap bgt produk @samsung_id #GalaxyS24 🔥🔥🔥 https://t.co/xyz",
+]
+
+
+def synthetic_tweets(n: int, seed: int = 0) -> List[str]:
+    """Korpus tweet sintetis dengan URL, mention, hashtag, emoji, entity, dan huruf berulang."""
+    import random
+
+    rng = random.Random(seed)
+    words = ["produk", "bagus", "jelek", "banget", "samsung", "promo", "murah",
+             "gooood", "wkwkwk", "nice", "bad", "hari", "ini", "kecewa", "puas"]
+    extras = ["https://t.co/{}", "@user{}", "#tag{}", "www.site{}.com", "😀", "&amp;",
+              "loool", "!!!", "x.com/{}", "&#64;name{}", "\n", "  "]
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(3, 40)):
+            if rng.random() < 0.25:
+                parts.append(rng.choice(extras).format(rng.randint(0, 999)))
+            else:
+                parts.append(rng.choice(words))
+        out.append(" ".join(parts))
+    return out
+
+
+def check_equivalence(texts: List[str]) -> int:
+    """Bandingkan normalizer dengan acuan untuk semua 16 kombinasi opsi; return jumlah beda."""
+    from itertools import product
+
+    mismatches = 0
+    for combo in product([True, False], repeat=4):
+        options = dict(zip(
+            ["keep_hashtag_text", "replace_mentions_with_tag", "lower", "remove_emojis"], combo
+        ))
+        fn = make_normalizer(**options)
+        for text in texts:
+            expected, actual = reference_clean_text(text, **options), fn(text)
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"❌ {options} {text!r}: {expected!r} != {actual!r}")
+    return mismatches
+
+
+def _bench(label: str, fn: Callable[[], object], n: int, repeats: int = 3):
+    best = min(_timed(fn) for _ in range(repeats))
+    print(f"{label:<28} {n / best:>12,.0f} teks/detik")
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend: python -m services.normalize [n_texts] [workers]
+    import os
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    corpus = synthetic_tweets(n)
+
+    bad = check_equivalence(EDGE_CASES + corpus[:5000])
+    print(f"Equivalence: {'OK' if bad == 0 else f'{bad} beda'} "
+          f"({len(EDGE_CASES) + min(n, 5000)} teks x 16 kombinasi opsi)")
+
+    _bench("reference clean_text", lambda: [reference_clean_text(t) for t in corpus], n)
+    _bench("make_normalizer()", lambda: _normalize_many(corpus, {}), n)
+    _bench(f"normalize_batch({workers} proses)",
+           lambda: normalize_batch(corpus, workers=workers), n, repeats=1)
+    sys.exit(1 if bad else 0)
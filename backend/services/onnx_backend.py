@@ -0,0 +1,186 @@
+import os
+import time
+import argparse
+from hashlib import blake2b
+from typing import List, Dict, Optional
+
+import numpy as np
+import torch
+
+ONNX_DIR = os.path.join(os.path.dirname(__file__), "onnx")
+
+
+def _require_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise RuntimeError(
+            "Backend 'onnx' butuh onnxruntime + onnx: pip install '.[onnx]'"
+        ) from e
+    return onnxruntime
+
+
+def onnx_cache_dir(source: str, revision: Optional[str] = None, root: str = ONNX_DIR) -> str:
+    """
+    Folder export untuk model dari `source` (folder lokal/registry atau nama hub).
+    Key-nya ikut ukuran & mtime file bobot/config (folder lokal) atau `revision`
+    (commit hub), jadi setelah model di registry di-update, graph ONNX lama
+    tidak terpakai lagi.
+    """
+    if os.path.isdir(source):
+        source = os.path.abspath(source)
+        stamp = [source]
+        for name in sorted(os.listdir(source)):
+            if name.endswith((".safetensors", ".bin", ".json")):
+                stat = os.stat(os.path.join(source, name))
+                stamp.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        label = os.path.basename(source)
+    else:
+        stamp = [source, revision or ""]
+        label = source.replace("/", "__")
+    digest = blake2b("\n".join(stamp).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(root, f"{label}-{digest}")
+
+
+def export_onnx(model, path: str):
+    """Export model HF (eager PyTorch) ke ONNX dengan batch & panjang dinamis."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    dummy = torch.ones((1, 8), dtype=torch.long)
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy, torch.ones_like(dummy)),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=17,
+        )
+
+
+class OnnxBackend:
+    """
+    Forward pass lewat ONNX Runtime (CPU), opsional int8 dynamic quantization.
+    File .onnx di-export sekali ke `export_dir` (default: `onnx_cache_dir(source)`)
+    lalu dipakai ulang; `source` adalah path/nama yang dipakai untuk memuat `model`.
+    Dipanggil dengan output tokenizer dan mengembalikan probabilitas softmax,
+    sama seperti SentimentAnalyzer._forward.
+    """
+
+    def __init__(
+        self,
+        model,
+        source: str,
+        quantize: bool = False,
+        export_dir: Optional[str] = None,
+        num_threads: Optional[int] = None,
+    ):
+        ort = _require_onnxruntime()
+        export_dir = export_dir or onnx_cache_dir(
+            source, getattr(model.config, "_commit_hash", None)
+        )
+        fp32_path = os.path.join(export_dir, "model.onnx")
+        if not os.path.exists(fp32_path):
+            export_onnx(model, fp32_path)
+
+        path = fp32_path
+        if quantize:
+            path = os.path.join(export_dir, "model.int8.onnx")
+            if not os.path.exists(path):
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+
+                quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.path = path
+        self.session = ort.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, inputs) -> np.ndarray:
+        feed = {
+            name: np.asarray(inputs[name].cpu().numpy(), dtype=np.int64)
+            for name in ("input_ids", "attention_mask")
+        }
+        logits = self.session.run(["logits"], feed)[0]
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+
+# =========================
+# PARITY & BENCHMARK
+# =========================
+def _time_backend(analyzer, cleaned: List[str], batch_size: int, repeats: int):
+    analyzer._probs(cleaned[:batch_size], batch_size, None)  # warmup
+    timings = []
+    probs = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        probs = analyzer._probs(cleaned, batch_size, None)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    n_batches = -(-len(cleaned) // batch_size)
+    return probs, {
+        "seconds": best,
+        "latency_ms_per_batch": 1000 * best / n_batches,
+        "texts_per_sec": len(cleaned) / best if best else 0.0,
+    }
+
+
+def compare_backends(
+    reference, candidates: Dict, texts: List[str], batch_size: int = 32, repeats: int = 3
+):
+    """
+    Jalankan `texts` di analyzer referensi (PyTorch) dan tiap kandidat,
+    laporkan persentase label yang sama, selisih probabilitas maksimum,
+    latency per batch, dan throughput.
+    """
+    cleaned = [reference.clean_text(t) for t in texts]
+    ref_probs, ref_timing = _time_backend(reference, cleaned, batch_size, repeats)
+    ref_labels = ref_probs.argmax(axis=-1)
+    report = {"torch": {**ref_timing, "label_agreement": 1.0, "max_abs_diff": 0.0}}
+
+    for name, analyzer in candidates.items():
+        probs, timing = _time_backend(analyzer, cleaned, batch_size, repeats)
+        report[name] = {
+            **timing,
+            "label_agreement": float((probs.argmax(axis=-1) == ref_labels).mean()),
+            "max_abs_diff": float(np.abs(probs - ref_probs).max()),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend: python -m services.onnx_backend --csv dataset_tweets.csv
+    import pandas as pd
+    from services.sentiment import SentimentAnalyzer
+
+    parser = argparse.ArgumentParser(description="Parity & benchmark torch vs onnx")
+    parser.add_argument("--csv", required=True, help="CSV dengan kolom teks tweet")
+    parser.add_argument("--column", default="text")
+    parser.add_argument("--limit", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv)[args.column].dropna().astype(str).tolist()[: args.limit]
+    reference = SentimentAnalyzer(device="cpu")
+    candidates = {
+        "onnx": SentimentAnalyzer(device="cpu", backend="onnx"),
+        "onnx-int8": SentimentAnalyzer(device="cpu", backend="onnx", quantize=True),
+    }
+    report = compare_backends(reference, candidates, texts, batch_size=args.batch_size)
+    print(f"{'backend':<10} {'agree':>7} {'max_diff':>9} {'ms/batch':>9} {'texts/s':>9}")
+    for name, r in report.items():
+        print(
+            f"{name:<10} {r['label_agreement']:>7.2%} {r['max_abs_diff']:>9.4f} "
+            f"{r['latency_ms_per_batch']:>9.1f} {r['texts_per_sec']:>9.1f}"
+        )
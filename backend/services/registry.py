@@ -0,0 +1,78 @@
+import os
+import sys
+import shutil
+from typing import Optional
+
+# direktori model lokal; satu subfolder per model: <root>/<org>__<name>/
+MODEL_REGISTRY_DIR = os.path.join(os.path.dirname(__file__), "models")
+WEIGHTS_FILE = "model.safetensors"
+
+
+def model_dir(model_name: str, root: str = MODEL_REGISTRY_DIR) -> str:
+    return os.path.join(root, model_name.replace("/", "__"))
+
+
+def is_registered(model_name: str, root: str = MODEL_REGISTRY_DIR) -> bool:
+    path = model_dir(model_name, root)
+    return os.path.isfile(os.path.join(path, "config.json")) and os.path.isfile(
+        os.path.join(path, WEIGHTS_FILE)
+    )
+
+
+def resolve_model(
+    model_name: str, root: str = MODEL_REGISTRY_DIR, offline: bool = False
+) -> Optional[str]:
+    """
+    Path lokal model di registry, atau None kalau belum di-pull (caller boleh
+    fallback ke hub). Dengan `offline=True` model yang belum ada jadi error,
+    bukan download diam-diam saat startup.
+    """
+    if is_registered(model_name, root):
+        return model_dir(model_name, root)
+    if offline:
+        raise RuntimeError(
+            f"Model {model_name!r} tidak ada di registry {root}. Jalankan: "
+            f"python -m services.registry pull {model_name}"
+        )
+    return None
+
+
+def pull_model(model_name: str, root: str = MODEL_REGISTRY_DIR) -> str:
+    """
+    Download model + tokenizer dari hub sekali, lalu simpan ke registry dengan
+    bobot safetensors (bisa di-mmap saat load, tanpa unpickle). Ditulis ke
+    folder sementara dulu supaya registry tidak pernah berisi model setengah jadi.
+    """
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    final_path = model_dir(model_name, root)
+    tmp_path = final_path + ".partial"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    tokenizer.save_pretrained(tmp_path)
+    model.save_pretrained(tmp_path, safe_serialization=True)
+
+    shutil.rmtree(final_path, ignore_errors=True)
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend:
+    #   python -m services.registry pull cardiffnlp/twitter-xlm-roberta-base-sentiment
+    #   python -m services.registry list
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "pull":
+        for name in sys.argv[2:]:
+            print(f"✅ {name} -> {pull_model(name)}")
+    elif command == "list":
+        if os.path.isdir(MODEL_REGISTRY_DIR):
+            for entry in sorted(os.listdir(MODEL_REGISTRY_DIR)):
+                name = entry.replace("__", "/")
+                if is_registered(name):
+                    print(name)
+    else:
+        print("usage: python -m services.registry [pull <model> ... | list]")
+        sys.exit(2)
@@ -1,29 +1,166 @@
 import json
 import os
-import re
+import asyncio
+import time
 import pandas as pd
+from contextlib import AsyncExitStack
 from datetime import datetime
 from urllib.parse import quote_plus
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
+from services.metrics import SCRAPE_STAGE_SECONDS, SCRAPE_TWEETS, SCRAPE_TWEETS_PER_SCROLL
+from services.seen_store import SeenStore
+from services.timeline_parser import is_timeline_response, parse_timeline_payload
+from services.tweet_dom import EXTRACT_NEW_TWEETS_JS, HAS_NEW_TWEET_NODE_JS
+
 COOKIES_FILE = os.path.join(os.path.dirname(__file__), "cookies.json")
 OUTPUT_FILE = "dataset_tweets.csv"
 BATCH_SIZE = 10
 DEFAULT_MAX = 100
+CSV_COLUMNS = ["timestamp", "text"]
+MAX_IDLE = 3  # stop kalau sudah 3 kali scroll tidak ada tweet baru
+
+
+# =========================
+# LEAN BROWSER PROFILE & RESOURCE BLOCKING
+# =========================
+LEAN_CHROMIUM_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+LEAN_CONTEXT_OPTIONS = {"service_workers": "block", "reduced_motion": "reduce"}
+
+# kita cuma butuh teks tweet: gambar, video, font, dan tracker tidak perlu dimuat
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "ads-twitter.com",
+    "ads-api.twitter.com",
+    "analytics.twitter.com",
+    "/jot/",
+    "client_event.json",
+)
+# sinyal halaman siap dipakai (tweet muncul, atau UI login/logged-in sudah render)
+PAGE_READY_SELECTOR = 'div[data-testid="tweetText"], a[aria-label="Home"], a[href="/login"]'
+
+
+class ResourcePolicy:
+    """
+    Aturan routing untuk context scraper: request dengan resource type di
+    `block_resource_types` atau URL yang mengandung salah satu `block_url_patterns`
+    di-abort. `wait_until` dipakai untuk page.goto; "domcontentloaded" jauh lebih
+    cepat dari "networkidle" karena X tidak pernah benar-benar idle.
+    """
+
+    def __init__(self,
+                 block_resource_types=BLOCKED_RESOURCE_TYPES,
+                 block_url_patterns=BLOCKED_URL_PATTERNS,
+                 wait_until="domcontentloaded"):
+        self.block_resource_types = set(block_resource_types)
+        self.block_url_patterns = tuple(block_url_patterns)
+        self.wait_until = wait_until
+        self.blocked = 0
+
+    def should_block(self, resource_type, url):
+        return resource_type in self.block_resource_types or any(
+            pattern in url for pattern in self.block_url_patterns
+        )
+
+    async def install(self, context):
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+def track_transfer(page):
+    """Hitung jumlah request dan byte (header + body) yang diterima `page`."""
+    counters = {"requests": 0, "bytes": 0}
+
+    async def on_finished(request):
+        counters["requests"] += 1
+        try:
+            sizes = await request.sizes()
+            counters["bytes"] += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        except Exception:
+            pass
+
+    page.on("requestfinished", on_finished)
+    return counters
+
+
+class ScrollPacer:
+    """
+    Pengganti `wheel(0, 2000)` + sleep 1500 ms yang tetap.
+
+    Setelah scroll, tunggu sinyal bahwa konten baru datang (node tweet baru di DOM,
+    atau response timeline di mode network) dengan batas `max_wait_ms`, jadi tidak
+    menunggu kelamaan saat timeline cepat dan tidak terlalu cepat menyerah saat lambat.
+    Jarak scroll disesuaikan dari hasil scroll sebelumnya: tidak ada tweet baru ->
+    scroll lebih jauh; terlalu banyak sekaligus -> lebih pendek (supaya node yang
+    di-virtualize X tidak terlewat).
+    """
+
+    def __init__(self, distance=2000, min_distance=800, max_distance=6000,
+                 max_wait_ms=4000, settle_ms=150, target_new=6):
+        self.distance = distance
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.max_wait_ms = max_wait_ms
+        self.settle_ms = settle_ms
+        self.target_new = target_new
+
+    def update(self, new_count):
+        if new_count == 0:
+            self.distance = min(self.max_distance, int(self.distance * 1.5))
+        elif new_count > 2 * self.target_new:
+            self.distance = max(self.min_distance, int(self.distance * 0.75))
+
+    async def scroll(self, page, wait_signal):
+        """Scroll sekali lalu tunggu `wait_signal(timeout_ms)`; return waktu tunggu (ms)."""
+        t0 = time.perf_counter()
+        await page.mouse.wheel(0, self.distance)
+        try:
+            await wait_signal(self.max_wait_ms)
+            # beri sedikit waktu supaya batch tweet yang sama selesai di-render
+            await page.wait_for_timeout(self.settle_ms)
+        except (PlaywrightTimeoutError, asyncio.TimeoutError):
+            pass
+        return (time.perf_counter() - t0) * 1000
+
 
 # =========================
 # CSV HELPERS
 # =========================
+_csv_headers_ready = set()
+
+
 def ensure_csv_header(csv_path):
     """
     Ensure the CSV file has the correct header.
+    Cek ke filesystem cukup sekali per path per proses.
     
     Parameter:
         csv_path: Path to the CSV file
     """
+    if csv_path in _csv_headers_ready:
+        return
     if not os.path.exists(csv_path):
-        df = pd.DataFrame(columns=["timestamp", "text"])
+        df = pd.DataFrame(columns=CSV_COLUMNS)
         df.to_csv(csv_path, index=False, encoding="utf-8")
+    _csv_headers_ready.add(csv_path)
 
 def save_batch(csv_path, batch):
     """
@@ -32,66 +169,63 @@ def save_batch(csv_path, batch):
     if not batch:
         return
 
-    df = pd.DataFrame(batch)
+    # kolom lain (mis. id/author dari mode network) tidak ikut ke CSV
+    df = pd.DataFrame(batch, columns=CSV_COLUMNS)
     df.to_csv(csv_path, index=False, mode='a', header=False, encoding="utf-8")
 
 
 # =========================
-# PREPROCESS TEXT
+# LOAD & INJECT COOKIES
 # =========================
-def preprocess_text(text):
-    # hapus URL (http/https/t.co/bit.ly dll)
-    text = re.sub(r"http\S+", "", text) 
-    # hapus mention @username
-    text = re.sub(r"@\w+", "", text)
-    # ganti multiple whitespace/newline jadi 1 spasi
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+def _read_cookies(cookies_file=COOKIES_FILE):
+    """
+    Baca cookies hasil export browser dan ubah ke format Playwright.
+    Raises kalau file tidak ada / formatnya rusak.
+    """
+    with open(cookies_file, "r", encoding="utf-8") as f:
+        raw_cookies = json.load(f)
+
+    cookies = []
+    for c in raw_cookies:
+        cookie = {
+            "name": c["name"],
+            "value": c["value"],
+            "domain": c["domain"],
+            "path": c.get("path", "/"),
+            "secure": c.get("secure", False),
+            "httpOnly": c.get("httpOnly", False),
+        }
+
+        # handle expiration
+        if "expirationDate" in c and c["expirationDate"] is not None:
+            cookie["expires"] = int(c["expirationDate"])
+        else:
+            cookie["expires"] = -1  # session cookie
+
+        # fix sameSite
+        same_site = str(c.get("sameSite", "")).capitalize()
+        if same_site == "No_restriction":
+            cookie["sameSite"] = "None"
+        elif same_site in ["Lax", "Strict", "None"]:
+            cookie["sameSite"] = same_site
+        else:
+            cookie["sameSite"] = "Lax"
+
+        cookies.append(cookie)
+    return cookies
 
 
-# =========================
-# LOAD & INJECT COOKIES
-# =========================
 async def _load_and_set_cookies(context, cookies_file=COOKIES_FILE):
     """
     Returns True if cookies loaded+set, False otherwise.
     (This is your loader, slightly hardened.)
     """
     try:
-        with open(cookies_file, "r", encoding="utf-8") as f:
-            raw_cookies = json.load(f)
-
-        cookies = []
-        for c in raw_cookies:
-            cookie = {
-                "name": c["name"],
-                "value": c["value"],
-                "domain": c["domain"],
-                "path": c.get("path", "/"),
-                "secure": c.get("secure", False),
-                "httpOnly": c.get("httpOnly", False),
-            }
-
-            # handle expiration
-            if "expirationDate" in c and c["expirationDate"] is not None:
-                cookie["expires"] = int(c["expirationDate"])
-            else:
-                cookie["expires"] = -1  # session cookie
-
-            # fix sameSite
-            same_site = str(c.get("sameSite", "")).capitalize()
-            if same_site == "No_restriction":
-                cookie["sameSite"] = "None"
-            elif same_site in ["Lax", "Strict", "None"]:
-                cookie["sameSite"] = same_site
-            else:
-                cookie["sameSite"] = "Lax"
-
-            cookies.append(cookie)
-
-        await context.add_cookies(cookies)
+        await context.add_cookies(_read_cookies(cookies_file))
+        return True
     except Exception as e:
         print(f"🔴[WARNING] gagal load cookies: {e}")
+        return False
 
 
 async def _is_logged_in(page):
@@ -114,35 +248,139 @@ async def _is_logged_in(page):
     return True
 
 
-async def scrape_search(search_query: str,
-                        max_tweets: int = DEFAULT_MAX,
-                        headless: bool = True,
-                        save_csv: bool = False,
-                        cookies_file: str = COOKIES_FILE):
+async def _close_quietly(obj):
+    try:
+        await obj.close()
+    except Exception:
+        pass
+
+
+async def iter_scrape_search(search_query: str,
+                             max_tweets: int = DEFAULT_MAX,
+                             headless: bool = True,
+                             save_csv: bool = False,
+                             cookies_file: str = COOKIES_FILE,
+                             pool=None,
+                             mode: str = "dom",
+                             capture_dir: str | None = None,
+                             resource_policy: ResourcePolicy | None = None,
+                             dataset_writer=None,
+                             near_dup_index=None,
+                             seen_store: SeenStore | None = None):
     """
-    Scrape tweets for `search_query`. Returns list[dict].
+    Versi incremental dari `scrape_search`: async generator yang menghasilkan event
+    begitu tweet tertangkap, tanpa menunggu semua `max_tweets` terkumpul.
+
+    Event (dict):
+        {"type": "ready", "page_ready_ms": waktu sampai timeline siap}
+        {"type": "tweet", "tweet": row, "total": n}
+        {"type": "progress", "total": n, "max_tweets": m, "new": k, "idle_rounds": i,
+         "extract_ms": waktu ekstraksi scroll ini, "wait_ms": waktu tunggu setelah
+         scroll sebelumnya, "scroll_px": jarak scroll saat ini}
+        {"type": "done", "total": n, "idle_rounds": i, "near_duplicates": {...}}
+    Kalau `pool` (BrowserPool) diberikan, context dipinjam dari pool dan cek
+    login dilewati selama hasil cek sebelumnya masih berlaku.
+
+    `mode`:
+        "dom"     - baca teks dari div[data-testid="tweetText"] (default)
+        "network" - ambil tweet dari response JSON SearchTimeline yang diterima
+                    page; row berisi id, waktu posting asli, dan author, dan dedup
+                    memakai id tweet. `capture_dir` (opsional) menyimpan tiap
+                    response mentah sebagai fixture untuk tes parser offline.
+
+    `resource_policy` (ResourcePolicy) memblokir resource yang tidak perlu dan
+    menentukan wait strategy page.goto; kalau pakai pool, default-nya policy pool.
+    Tanpa policy, perilaku lama dipakai (semua resource dimuat, networkidle).
+
+    `dataset_writer` (services.dataset.DatasetWriter) menerima tiap tweet baru dan
+    menulisnya sebagai Parquet terpartisi; di-close otomatis saat scraping selesai.
+
+    `near_dup_index` (services.near_dup.NearDuplicateIndex) membuang tweet yang
+    hampir sama dengan tweet sebelumnya (retweet dengan mention/link lain, beda
+    satu-dua kata) sebelum disimpan; statistiknya ikut di event "done".
+
+    `seen_store` (services.seen_store.SeenStore) dipakai untuk dedup tweet
+    (satu key per tweet: id atau link status) dengan memori terbatas. Kalau punya `root`, isinya disimpan setelah
+    scraping, jadi run berikutnya untuk query yang sama melewati tweet yang
+    sudah pernah diambil. Default: store di memori untuk run ini saja.
     Raises RuntimeError on irrecoverable issues (login required / blocked).
     """
-    tweets = []
-    seen = set()
+    total = 0
+    if seen_store is None:
+        seen_store = SeenStore(search_query, root=None)
     batch = []
+    if mode not in ("dom", "network"):
+        raise ValueError(f"Unknown scrape mode: {mode!r} (expected 'dom' or 'network')")
+    captured = []  # tweet hasil parse response timeline (mode network)
+    response_arrived = asyncio.Event()
+
+    async def on_response(response):
+        if not is_timeline_response(response.url):
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            print(f"[SKIP] gagal baca response timeline: {e}")
+            return
+        if capture_dir:
+            os.makedirs(capture_dir, exist_ok=True)
+            path = os.path.join(capture_dir, f"timeline_{time.time_ns()}.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, ensure_ascii=False)
+        captured.extend(parse_timeline_payload(payload))
+        response_arrived.set()
+
+    async def wait_new_content(timeout_ms):
+        if mode == "network":
+            await asyncio.wait_for(response_arrived.wait(), timeout_ms / 1000)
+        else:
+            await page.wait_for_function(HAS_NEW_TWEET_NODE_JS, timeout=timeout_ms)
 
     url = f"https://x.com/search?q={quote_plus(search_query)}&src=typed_query&f=live"
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context()
+    async with AsyncExitStack() as stack:
+        # 1) context: pinjam dari pool, atau launch browser + set cookies sendiri
+        t_context = time.perf_counter()
+        if pool is not None:
+            context = await stack.enter_async_context(pool.context())
+            resource_policy = resource_policy or pool.resource_policy
+        else:
+            p = await stack.enter_async_context(async_playwright())
+            with SCRAPE_STAGE_SECONDS.time(stage="browser_launch"):
+                browser = await p.chromium.launch(
+                    headless=headless, args=LEAN_CHROMIUM_ARGS if resource_policy else None
+                )
+            stack.push_async_callback(_close_quietly, browser)
+            context = await browser.new_context(**(LEAN_CONTEXT_OPTIONS if resource_policy else {}))
+            stack.push_async_callback(_close_quietly, context)
+            if resource_policy is not None:
+                await resource_policy.install(context)
+            await _load_and_set_cookies(context, cookies_file)
         page = await context.new_page()
-
-        # 1) set cookies if ada
-        await _load_and_set_cookies(context, cookies_file)
+        SCRAPE_STAGE_SECONDS.observe(time.perf_counter() - t_context, stage="context")
+        if mode == "network":
+            page.on("response", on_response)
 
         try:
-            # 2) navigate - gunakan networkidle untuk SPA
-            await page.goto(url, wait_until="networkidle", timeout=120000)
-
-            # 3) cek apakah login diperlukan
-            logged_in = await _is_logged_in(page)
+            # 2) navigate - networkidle untuk SPA, atau wait strategy yang lebih ringan dari policy
+            t_nav = time.perf_counter()
+            wait_until = resource_policy.wait_until if resource_policy else "networkidle"
+            with SCRAPE_STAGE_SECONDS.time(stage="goto"):
+                await page.goto(url, wait_until=wait_until, timeout=120000)
+            if wait_until != "networkidle":
+                # DOM sudah ada tapi UI belum tentu render; tunggu tanda pertama
+                try:
+                    await page.wait_for_selector(PAGE_READY_SELECTOR, timeout=30000)
+                except PlaywrightTimeoutError:
+                    pass
+
+            # 3) cek apakah login diperlukan (hasil cek di-cache oleh pool)
+            if pool is not None and pool.login_verified:
+                logged_in = True
+            else:
+                logged_in = await _is_logged_in(page)
+                if pool is not None and logged_in:
+                    await pool.remember_login(context)
 
             if not logged_in:
                 debug_dir = "debug"
@@ -158,11 +396,17 @@ async def scrape_search(search_query: str,
                     f"Saved debug files: {img_path}, {html_path}"
                 )
 
-            # 4) wait for tweet selector to appear (shorter timeout)
+            # 4) tunggu tweet pertama: di mode network cukup response timeline pertama
+            #    (tidak bergantung pada markup), di mode dom elemen tweetText
             try:
-                await page.wait_for_selector('div[data-testid="tweetText"]', timeout=60000)
-            except PlaywrightTimeoutError:
-                # kemungkinan selector berubah / rate limit / blocked
+                if mode == "network":
+                    await asyncio.wait_for(response_arrived.wait(), 60)
+                else:
+                    await page.wait_for_selector('div[data-testid="tweetText"]', timeout=60000)
+            except (PlaywrightTimeoutError, asyncio.TimeoutError):
+                # kemungkinan selector berubah / rate limit / blocked / cookies expired
+                if pool is not None:
+                    pool.invalidate_login()
                 debug_dir = "debug"
                 os.makedirs(debug_dir, exist_ok=True)
                 img_path = os.path.join(debug_dir, "no_tweets_found.png")
@@ -171,65 +415,129 @@ async def scrape_search(search_query: str,
                 content = await page.content()
                 with open(html_path, "w", encoding="utf-8") as fh:
                     fh.write(content)
+                missing = "response timeline" if mode == "network" else "elemen tweetText"
                 raise RuntimeError(
-                    "❌ Tidak menemukan elemen tweetText. "
+                    f"❌ Tidak menemukan {missing}. "
                     f"Saved debug files: {img_path}, {html_path}"
                 )
 
+            page_ready_ms = (time.perf_counter() - t_nav) * 1000
+            SCRAPE_STAGE_SECONDS.observe(page_ready_ms / 1000, stage="page_ready")
+            print(f"[READY] timeline siap dalam {page_ready_ms:.0f} ms (wait_until={wait_until})")
+            yield {"type": "ready", "page_ready_ms": round(page_ready_ms, 1)}
+
             # 5) extraction loop (guard with seen set)
             idle_rounds = 0
-            MAX_IDLE = 3  # stop kalau sudah 3 kali loop tidak ada tweet baru
-
-            while len(tweets) < max_tweets:
-                elements = page.locator('div[data-testid="tweetText"]')
-                count = await elements.count()
+            pacer = ScrollPacer()
+            wait_ms = 0.0
+
+            while total < max_tweets:
+                # clear sebelum ekstraksi: response yang datang selama ekstraksi/yield tetap
+                # membangunkan wait setelah scroll berikutnya
+                response_arrived.clear()
+                t0 = time.perf_counter()
+                if mode == "network":
+                    nodes = [{"key": t["id"], **t} for t in captured]
+                    captured.clear()
+                else:
+                    try:
+                        nodes = await page.evaluate(EXTRACT_NEW_TWEETS_JS)
+                    except Exception as e:
+                        print(f"[SKIP] gagal ekstrak tweet: {e}")
+                        nodes = []
+                extract_ms = (time.perf_counter() - t0) * 1000
+                SCRAPE_STAGE_SECONDS.observe(extract_ms / 1000, stage="extract")
                 new_count = 0
 
-                if count == 0:
-                    # coba scroll dan tunggu
-                    await page.mouse.wheel(0, 2000)
-                    await page.wait_for_timeout(1500)
-                    count = await elements.count()
-                    if count == 0:
-                        idle_rounds += 1
-                        if idle_rounds >= MAX_IDLE:
-                            print("⚠️ [STOP] Tidak ada tweet baru setelah beberapa kali scroll")
-                            break
-                        continue
-
-                for i in range(count):
-                    if len(tweets) >= max_tweets:
+                for node in nodes:
+                    if total >= max_tweets:
                         break
-                    try:
-                        text = (await elements.nth(i).inner_text(timeout=5000)).strip()
-                    except Exception as e:
-                        # skip element kalau error inner_text
-                        print(f"[SKIP] gagal baca tweet ke-{i}: {e}")
+                    # teks disimpan apa adanya (whitespace dirapikan saja); cleaning hanya satu
+                    # kali, di analyzer (services/normalize.py), supaya aturannya tidak dobel/beda
+                    text = " ".join((node.get("text") or "").split())
+                    key = node.get("key") or text
+                    if not text:
                         continue
-                    if not text or text in seen:
+                    # satu entry per tweet (id / link status; teks hanya kalau link tidak ada),
+                    # supaya fill rate Bloom filter sesuai SEEN_CAPACITY & SEEN_FP_RATE. Teks
+                    # kembar dengan id beda adalah tweet lain; itu urusan near_dup_index.
+                    if not seen_store.add(key):
                         continue
-
-                    seen.add(text)
-                    row = {
-                        "timestamp": datetime.now().isoformat(),
-                        "text": preprocess_text(text)
-                    }
-                    tweets.append(row)
-                    batch.append(row)
+                    if near_dup_index is not None and near_dup_index.add(text)[1]:
+                        continue
+                    if mode == "network":
+                        row = {
+                            "id": node["id"],
+                            "timestamp": node["timestamp"],
+                            "text": text,
+                            "author": node["author"],
+                        }
+                    else:
+                        row = {
+                            "timestamp": datetime.now().isoformat(),
+                            "text": text,
+                        }
+                    total += 1
                     new_count += 1
 
-                    print(f"[+] Tweet baru ditangkap (total={len(tweets)})")
+                    print(f"[+] Tweet baru ditangkap (total={total})")
+
+                    # simpan sebelum yield: consumer bisa berhenti iterasi setelah tweet ini
+                    # (limit tercapai / client putus), dan kode setelah yield tidak jalan lagi
+                    if dataset_writer is not None:
+                        full = dataset_writer.buffer(row)
+                        if full:
+                            await asyncio.to_thread(dataset_writer.write, full)
 
                     # flush ke CSV kalau diminta
-                    if save_csv and len(batch) >= BATCH_SIZE:
-                        ensure_csv_header(OUTPUT_FILE)
-                        save_batch(OUTPUT_FILE, batch)
-                        print(f"💾 Flushed {len(batch)} tweets ke {OUTPUT_FILE}")
-                        batch.clear()
+                    if save_csv:
+                        batch.append(row)
+                        if len(batch) >= BATCH_SIZE:
+                            ensure_csv_header(OUTPUT_FILE)
+                            save_batch(OUTPUT_FILE, batch)
+                            print(f"💾 Flushed {len(batch)} tweets ke {OUTPUT_FILE}")
+                            batch.clear()
+
+                    yield {"type": "tweet", "tweet": row, "total": total}
+
+                SCRAPE_TWEETS_PER_SCROLL.observe(new_count)
+                SCRAPE_TWEETS.inc(new_count, mode=mode)
+                print(
+                    f"[SCROLL] {new_count} tweet baru dari {len(nodes)} node, "
+                    f"tunggu {wait_ms:.0f} ms, ekstraksi {extract_ms:.1f} ms, "
+                    f"jarak {pacer.distance}px"
+                )
 
-                # scroll to load more
-                await page.mouse.wheel(0, 2000)
-                await page.wait_for_timeout(1500)
+                # hitung scroll tanpa tweet baru, berhenti kalau sudah MAX_IDLE kali
+                idle_rounds = 0 if new_count else idle_rounds + 1
+                yield {
+                    "type": "progress",
+                    "total": total,
+                    "max_tweets": max_tweets,
+                    "new": new_count,
+                    "idle_rounds": idle_rounds,
+                    "extract_ms": round(extract_ms, 1),
+                    "wait_ms": round(wait_ms, 1),
+                    "scroll_px": pacer.distance,
+                }
+                if total >= max_tweets:
+                    break
+                if idle_rounds >= MAX_IDLE:
+                    print("⚠️ [STOP] Tidak ada tweet baru setelah beberapa kali scroll")
+                    break
+
+                # scroll to load more, tunggu sampai konten baru datang (maks pacer.max_wait_ms)
+                pacer.update(new_count)
+                wait_ms = await pacer.scroll(page, wait_new_content)
+                SCRAPE_STAGE_SECONDS.observe(wait_ms / 1000, stage="scroll_wait")
+
+            yield {
+                "type": "done",
+                "total": total,
+                "idle_rounds": idle_rounds,
+                "near_duplicates": near_dup_index.stats() if near_dup_index else None,
+                "seen": seen_store.stats(),
+            }
 
         finally:
             # simpan batch tersisa kalo perlu
@@ -237,14 +545,94 @@ async def scrape_search(search_query: str,
                 ensure_csv_header(OUTPUT_FILE)
                 save_batch(OUTPUT_FILE, batch)
                 print(f"💾 Flushed sisa {len(batch)} tweets ke {OUTPUT_FILE}")
+            if dataset_writer is not None:
+                await asyncio.to_thread(dataset_writer.close)
+                print(f"💾 Dataset: {dataset_writer.rows_written} tweets di {dataset_writer.root}")
+            # tulis + OR-merge bitmap (~1.6 MB) di thread, bukan di event loop
+            await asyncio.to_thread(seen_store.save)
+
+            await _close_quietly(page)
 
-            try:
-                await context.close()
-            except Exception:
-                pass
-            try:
-                await browser.close()
-            except Exception:
-                pass
 
+async def scrape_search(search_query: str,
+                        max_tweets: int = DEFAULT_MAX,
+                        headless: bool = True,
+                        save_csv: bool = False,
+                        cookies_file: str = COOKIES_FILE,
+                        pool=None,
+                        mode: str = "dom",
+                        dataset_writer=None,
+                        near_dup_index=None,
+                        seen_store: SeenStore | None = None):
+    """
+    Scrape tweets for `search_query`. Returns list[dict].
+    `mode`, `dataset_writer`, `near_dup_index` dan `seen_store` seperti di
+    `iter_scrape_search`.
+    Raises RuntimeError on irrecoverable issues (login required / blocked).
+    """
+    tweets = []
+    async for event in iter_scrape_search(search_query,
+                                          max_tweets=max_tweets,
+                                          headless=headless,
+                                          save_csv=save_csv,
+                                          cookies_file=cookies_file,
+                                          pool=pool,
+                                          mode=mode,
+                                          dataset_writer=dataset_writer,
+                                          near_dup_index=near_dup_index,
+                                          seen_store=seen_store):
+        if event["type"] == "tweet":
+            tweets.append(event["tweet"])
     return tweets
+
+
+async def measure_page_load(search_query: str,
+                            resource_policy: ResourcePolicy | None = None,
+                            headless: bool = True,
+                            cookies_file: str = COOKIES_FILE):
+    """
+    Buka halaman search sekali dan ukur waktu sampai tweet pertama tampil serta
+    byte yang ditransfer, dengan atau tanpa `resource_policy`.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=headless, args=LEAN_CHROMIUM_ARGS if resource_policy else None
+        )
+        try:
+            context = await browser.new_context(**(LEAN_CONTEXT_OPTIONS if resource_policy else {}))
+            if resource_policy is not None:
+                await resource_policy.install(context)
+            await _load_and_set_cookies(context, cookies_file)
+            page = await context.new_page()
+            transfer = track_transfer(page)
+
+            url = f"https://x.com/search?q={quote_plus(search_query)}&src=typed_query&f=live"
+            wait_until = resource_policy.wait_until if resource_policy else "networkidle"
+            t0 = time.perf_counter()
+            await page.goto(url, wait_until=wait_until, timeout=120000)
+            await page.wait_for_selector('div[data-testid="tweetText"]', timeout=60000)
+            ready_ms = (time.perf_counter() - t0) * 1000
+            return {
+                "wait_until": wait_until,
+                "page_ready_ms": round(ready_ms, 1),
+                "requests": transfer["requests"],
+                "bytes": transfer["bytes"],
+                "blocked": resource_policy.blocked if resource_policy else 0,
+            }
+        finally:
+            await _close_quietly(browser)
+
+
+if __name__ == "__main__":
+    # bandingkan page load dengan & tanpa blocking (jalankan dari folder backend):
+    #   python -m services.scraper "samsung"
+    import sys
+
+    query = sys.argv[1] if len(sys.argv) > 1 else "samsung"
+    for label, policy in (("tanpa blocking", None), ("dengan blocking", ResourcePolicy())):
+        result = asyncio.run(measure_page_load(query, policy))
+        print(
+            f"{label:<16} ready={result['page_ready_ms']:>8.0f} ms  "
+            f"bytes={result['bytes'] / 1024:>8.0f} KiB  requests={result['requests']:>4}  "
+            f"blocked={result['blocked']:>4}  ({result['wait_until']})"
+        )
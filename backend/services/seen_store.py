@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import math
+import time
+from hashlib import blake2b
+from typing import Dict, Optional
+
+SEEN_DIR = "seen"
+FORMAT_VERSION = 1
+
+
+def _slug(search_query: str) -> str:
+    # sama dengan services.dataset.query_slug; modul ini sengaja tanpa dependency
+    # supaya bisa dipakai juga oleh tweets_scraper.py di root
+    return re.sub(r"[^\w]+", "_", search_query.strip().lower()).strip("_") or "query"
+
+
+def bloom_size(capacity: int, fp_rate: float):
+    """Jumlah bit dan hash optimal untuk `capacity` item dengan false positive `fp_rate`."""
+    bits = max(64, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+    bits = -(-bits // 8) * 8  # bulatkan ke byte
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def _or_bytes(a: bytes, b: bytes) -> bytearray:
+    return bytearray((int.from_bytes(a, "little") | int.from_bytes(b, "little")).to_bytes(len(a), "little"))
+
+
+class SeenStore:
+    """
+    Pengganti set `seen` untuk dedup tweet: Bloom filter per query dengan
+    memori tetap, disimpan ke `<root>/<query>.seen` supaya run berikutnya
+    untuk query yang sama tidak mengambil (dan men-skor) tweet yang sama lagi.
+
+    Window `window_days` dibagi jadi `slices` Bloom filter berdasarkan waktu;
+    key dicatat di slice yang sedang aktif dan slice yang sudah lewat window
+    dibuang, jadi tweet lama otomatis "terlupa". `capacity` adalah perkiraan
+    jumlah key unik per window (memori ~ `slices` x Bloom filter untuk
+    `capacity` key, ~1.6 MB per query dengan default); false positive rate
+    total (key baru dianggap sudah pernah dilihat) kira-kira `fp_rate`.
+    Tidak ada false negative.
+
+    Dengan `root=None` store hanya di memori (tetap dengan memori terbatas).
+    """
+
+    def __init__(
+        self,
+        search_query: str,
+        root: Optional[str] = SEEN_DIR,
+        capacity: int = 100_000,
+        fp_rate: float = 0.001,
+        window_days: float = 7.0,
+        slices: int = 7,
+    ):
+        self.query = _slug(search_query)
+        self.path = os.path.join(root, f"{self.query}.seen") if root else None
+        self.slice_seconds = window_days * 86400 / slices
+        self.n_slices = slices
+        # tiap slice harus muat `capacity` (satu run besar bisa masuk ke satu slice),
+        # dan fp-nya dibagi rata supaya gabungan semua slice tetap ~fp_rate
+        self.bits, self.hashes = bloom_size(capacity, fp_rate / slices)
+        self._slices: Dict[int, bytearray] = {}
+        self.added = 0
+        self.hits = 0
+        if self.path and os.path.exists(self.path):
+            self._slices = self._read(self.path)
+        self._expire()
+
+    # ---------- bloom ----------
+    def _positions(self, key: str):
+        digest = blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _test(bitmap: bytearray, positions) -> bool:
+        return all(bitmap[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def _current_slice(self) -> int:
+        return int(time.time() // self.slice_seconds)
+
+    def _expire(self) -> bytearray:
+        current = self._current_slice()
+        for slice_id in [s for s in self._slices if s <= current - self.n_slices]:
+            del self._slices[slice_id]
+        if current not in self._slices:
+            self._slices[current] = bytearray(self.bits // 8)
+        return self._slices[current]
+
+    def __contains__(self, key: str) -> bool:
+        self._expire()
+        positions = self._positions(key)
+        return any(self._test(bitmap, positions) for bitmap in self._slices.values())
+
+    def add(self, key: str) -> bool:
+        """Catat `key`; return True kalau key baru (belum pernah terlihat dalam window)."""
+        current = self._expire()
+        positions = self._positions(key)
+        if any(self._test(bitmap, positions) for bitmap in self._slices.values()):
+            self.hits += 1
+            return False
+        for p in positions:
+            current[p >> 3] |= 1 << (p & 7)
+        self.added += 1
+        return True
+
+    # ---------- persistence ----------
+    def _header(self) -> dict:
+        return {
+            "version": FORMAT_VERSION,
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "slice_seconds": self.slice_seconds,
+            "slices": sorted(self._slices),
+        }
+
+    def _read(self, path: str) -> Dict[int, bytearray]:
+        with open(path, "rb") as fh:
+            header = json.loads(fh.readline())
+            expected = self._header()
+            if any(header.get(k) != expected[k] for k in ("version", "bits", "hashes", "slice_seconds")):
+                print(f"⚠️ [SEEN] {path} dibuat dengan parameter lain, mulai dari kosong")
+                return {}
+            size = self.bits // 8
+            return {slice_id: bytearray(fh.read(size)) for slice_id in header["slices"]}
+
+    def save(self):
+        """Tulis ke disk (atomic). Isi file yang ditulis run lain sejak load ikut digabung (OR)."""
+        if not self.path:
+            return
+        self._expire()
+        if os.path.exists(self.path):
+            for slice_id, bitmap in self._read(self.path).items():
+                if slice_id in self._slices:
+                    self._slices[slice_id] = _or_bytes(self._slices[slice_id], bitmap)
+            self._expire()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(json.dumps(self._header()).encode("utf-8") + b"\n")
+            for slice_id in sorted(self._slices):
+                fh.write(self._slices[slice_id])
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict:
+        return {
+            "query": self.query,
+            "added": self.added,
+            "already_seen": self.hits,
+            "memory_bytes": len(self._slices) * self.bits // 8,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
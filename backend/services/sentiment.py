@@ -1,32 +1,105 @@
-import re
-import html
-from typing import List, Dict
+import gc
+import time
+from typing import List, Dict, Optional
 import torch
 import numpy as np
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
-URL_PATTERN = re.compile(
-    r"(https?://\S+|www\.\S+|(?:\b[\w-]+\.)+[a-zA-Z]{2,})(?=\s|$)",
-    flags=re.IGNORECASE,
-)
-
-MENTION_PATTERN = re.compile(r"@\w+")
-HASHTAG_PATTERN = re.compile(r"#(\w+)")
-MULTI_WS = re.compile(r"\s+")
-REPEAT_CHARS = re.compile(r"(.)\1{2,}")
+from services.cache import PredictionCache
+from services.metrics import INFERENCE_STAGE_SECONDS, MODEL_BATCH_SIZE
+from services.normalize import get_normalizer, normalize_batch
+
+MAX_LENGTH = 512
+
+
+def plan_token_batches(lengths: List[int], max_tokens: int) -> List[List[int]]:
+    """
+    Kelompokkan index per panjang token (urut naik) supaya ukuran setelah
+    padding, `len(batch) * terpanjang_di_batch`, tidak melewati `max_tokens`.
+    Satu sequence yang sendirian sudah melewati budget tetap dapat batch sendiri.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current, longest = [], [], 0
+    for idx in order:
+        longest_if_added = max(longest, lengths[idx])
+        if current and (len(current) + 1) * longest_if_added > max_tokens:
+            batches.append(current)
+            current, longest_if_added = [], lengths[idx]
+        current.append(idx)
+        longest = longest_if_added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_stats(lengths: List[int], batches: List[List[int]]) -> Dict:
+    """Jumlah token asli vs setelah padding untuk satu rencana batch, plus porsi yang terbuang."""
+    real = sum(lengths[i] for b in batches for i in b)
+    padded = sum(len(b) * max(lengths[i] for i in b) for b in batches if b)
+    return {
+        "batches": len(batches),
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_waste": (1 - real / padded) if padded else 0.0,
+    }
 
 
 class SentimentAnalyzer:
     def __init__(
-        self, model_name="cardiffnlp/twitter-xlm-roberta-base-sentiment", device=None
+        self,
+        model_name="cardiffnlp/twitter-xlm-roberta-base-sentiment",
+        device=None,
+        cache: Optional[PredictionCache] = None,
+        backend: str = "torch",
+        quantize: bool = False,
+        model_path: Optional[str] = None,
     ):
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown backend: {backend!r} (expected 'torch' or 'onnx')")
+        self.model_name = model_name
+        self.backend = backend
         self.labels = ["Negative", "Neutral", "Positive"]
+        self.cache = cache
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        # durasi tiap fase load (detik), dibaca oleh /ready
+        self.load_timings: Dict[str, float] = {}
+
+        # model_path: folder lokal (services/registry.py) berisi model.safetensors,
+        # yang di-mmap saat load dan tidak perlu akses jaringan
+        source = model_path or model_name
+        local = {"local_files_only": True} if model_path else {}
+        start = time.perf_counter()
         # set use_fast=False only if you need it; fast tokenizers are usually faster
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(source, use_fast=True, **local)
+        self.load_timings["tokenizer"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.model = AutoModelForSequenceClassification.from_pretrained(source, **local)
         self.model.to(self.device)
         self.model.eval()
+        self.load_timings["model"] = time.perf_counter() - start
+
+        # "onnx": forward pass lewat ONNX Runtime CPU (opsional int8), API tetap sama
+        self._onnx = None
+        if backend == "onnx":
+            from services.onnx_backend import OnnxBackend
+
+            start = time.perf_counter()
+            self._onnx = OnnxBackend(self.model, source, quantize=quantize)
+            self.load_timings["onnx"] = time.perf_counter() - start
+            # graph ONNX memegang bobotnya sendiri; model torch dilepas supaya RAM tidak dobel
+            self.model = None
+            gc.collect()
+
+    def warmup(self, batch_size: int = 8, length: int = 64) -> float:
+        """
+        Jalankan satu batch dummy (tanpa cache) supaya alokasi memori, kernel
+        dan thread pool sudah siap sebelum request pertama. Return detik.
+        """
+        start = time.perf_counter()
+        self._probs_chunk([" ".join(["warmup"] * length)] * batch_size)
+        self.load_timings["warmup"] = time.perf_counter() - start
+        return self.load_timings["warmup"]
 
     def clean_text(
         self,
@@ -37,54 +110,31 @@ class SentimentAnalyzer:
         lower: bool = False,
         remove_emojis: bool = False,
     ) -> str:
-        if not isinstance(text, str):
-            return ""
-
-        # unescape HTML entities
-        text = html.unescape(text)
-
-        # remove URLs (full urls, www, and simple domain patterns)
-        text = URL_PATTERN.sub("", text)
-
-        # normalize mentions
-        if replace_mentions_with_tag:
-            text = MENTION_PATTERN.sub("@user", text)
-        else:
-            text = MENTION_PATTERN.sub("", text)
-
-        # hashtags: either remove '#' but keep the word (topic), or remove entirely
-        if keep_hashtag_text:
-            text = HASHTAG_PATTERN.sub(r"\1", text)  # turn #AI -> AI
-        else:
-            text = HASHTAG_PATTERN.sub("", text)
-
-        # optionally remove emojis (very lossy); better to map them to text if useful
-        if remove_emojis:
-            # crude emoji removal: remove non-word, non-space typical emojis (works often)
-            text = re.sub(r"[^\x00-\x7F]+", " ", text)
-
-        # reduce repeated characters (heyyyy -> heyy)
-        text = REPEAT_CHARS.sub(r"\1\1", text)
-
-        # remove extra whitespace and strip
-        text = MULTI_WS.sub(" ", text).strip()
-
-        if lower:
-            text = text.lower()
-
-        return text
-
-    def _predict_chunk(self, texts: list[str]) -> list[dict]:
-        cleaned = [self.clean_text(t) for t in texts]
-        inputs = self.tokenizer(
-            cleaned, return_tensors="pt", padding=True, truncation=True, max_length=512
-        )
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            probs = torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
-
+        # regex & cabang opsi sudah disiapkan sekali di services/normalize.py
+        return get_normalizer(
+            keep_hashtag_text=keep_hashtag_text,
+            replace_mentions_with_tag=replace_mentions_with_tag,
+            lower=lower,
+            remove_emojis=remove_emojis,
+        )(text)
+
+    def _forward(self, inputs) -> np.ndarray:
+        MODEL_BATCH_SIZE.observe(len(inputs["input_ids"]))
+        with INFERENCE_STAGE_SECONDS.time(stage="forward"):
+            if self._onnx is not None:
+                return self._onnx(inputs)
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+                logits = outputs.logits
+                return torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
+
+    def _clean(self, texts: List[str]) -> List[str]:
+        with INFERENCE_STAGE_SECONDS.time(stage="clean"):
+            return normalize_batch(texts)
+
+    def _build_results(self, texts: list[str], cleaned: list[str], probs) -> list[dict]:
+        start = time.perf_counter()
         results = []
         for orig_text, clean_text, p in zip(texts, cleaned, probs):
             pred_idx = int(np.argmax(p))
@@ -98,11 +148,102 @@ class SentimentAnalyzer:
                     "Positive": float(p[2]),
                 }
             )
+        INFERENCE_STAGE_SECONDS.observe(time.perf_counter() - start, stage="postprocess")
         return results
 
-    def predict_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict]:
-        results = []
-        for i in range(0, len(texts), batch_size):
-            chunk = texts[i : i + batch_size]
-            results.extend(self._predict_chunk(chunk))
-        return results
+    def _encode_ids(self, cleaned: list[str]) -> list[list[int]]:
+        with INFERENCE_STAGE_SECONDS.time(stage="tokenize"):
+            return self.tokenizer(cleaned, truncation=True, max_length=MAX_LENGTH)[
+                "input_ids"
+            ]
+
+    def _probs_chunk(self, cleaned: list[str]) -> np.ndarray:
+        with INFERENCE_STAGE_SECONDS.time(stage="tokenize"):
+            inputs = self.tokenizer(
+                cleaned,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=MAX_LENGTH,
+            )
+        return self._forward(inputs)
+
+    def _probs_bucketed(self, cleaned: List[str], max_tokens: int) -> np.ndarray:
+        """
+        Tokenize semua teks sekali, kelompokkan per panjang dengan budget token,
+        lalu kembalikan probabilitas ke urutan input semula.
+        """
+        input_ids = self._encode_ids(cleaned)
+        lengths = [len(ids) for ids in input_ids]
+        probs = np.zeros((len(cleaned), len(self.labels)), dtype=np.float32)
+        for batch in plan_token_batches(lengths, max_tokens):
+            with INFERENCE_STAGE_SECONDS.time(stage="tokenize"):
+                inputs = self.tokenizer.pad(
+                    {"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt"
+                )
+            probs[batch] = self._forward(inputs)
+        return probs
+
+    def _probs(
+        self, cleaned: List[str], batch_size: int, max_tokens: int | None
+    ) -> np.ndarray:
+        if not cleaned:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        if max_tokens:
+            return self._probs_bucketed(cleaned, max_tokens)
+        return np.concatenate(
+            [
+                self._probs_chunk(cleaned[i : i + batch_size])
+                for i in range(0, len(cleaned), batch_size)
+            ]
+        )
+
+    def _probs_dedup(
+        self, cleaned: List[str], batch_size: int, max_tokens: int | None
+    ) -> np.ndarray:
+        """
+        Jalankan model sekali per cleaned text yang unik (dan hanya yang belum
+        ada di cache), lalu kembangkan lagi jadi satu baris per input.
+        """
+        if not cleaned:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        unique = list(dict.fromkeys(cleaned))
+        known = self.cache.get_many(unique) if self.cache is not None else {}
+        misses = [c for c in unique if c not in known]
+        if misses:
+            fresh = dict(zip(misses, self._probs(misses, batch_size, max_tokens)))
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+            known.update(fresh)
+        return np.asarray([known[c] for c in cleaned], dtype=np.float32)
+
+    def measure_padding(
+        self, texts: List[str], batch_size: int = 32, max_tokens: int | None = None
+    ) -> Dict:
+        """
+        Porsi padding yang terbuang untuk `texts` dengan batch ukuran tetap atau
+        budget token; dihitung dari tokenizer saja (tanpa forward pass).
+        """
+        cleaned = normalize_batch(texts)
+        lengths = [len(ids) for ids in self._encode_ids(cleaned)]
+        if max_tokens:
+            batches = plan_token_batches(lengths, max_tokens)
+        else:
+            batches = [
+                list(range(i, min(i + batch_size, len(lengths))))
+                for i in range(0, len(lengths), batch_size)
+            ]
+        return padding_stats(lengths, batches)
+
+    def predict_batch(
+        self, texts: List[str], batch_size: int = 32, max_tokens: int | None = None
+    ) -> List[Dict]:
+        """
+        Prediksi `texts` sesuai urutan. Cleaned text yang sama hanya diskor sekali
+        dan dicari dulu di `self.cache` kalau ada. Dengan `max_tokens`, input
+        diurutkan per panjang token dan di-batch per budget token setelah
+        padding, bukan per `batch_size`.
+        """
+        cleaned = self._clean(texts)
+        probs = self._probs_dedup(cleaned, batch_size, max_tokens)
+        return self._build_results(texts, cleaned, probs)
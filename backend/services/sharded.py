@@ -0,0 +1,189 @@
+import os
+import time
+import argparse
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# analyzer milik proses worker; dibuat sekali oleh _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(threads: int, analyzer_kwargs: dict):
+    global _worker_analyzer
+    # harus diset sebelum torch di-import supaya OpenMP/MKL tidak membuat thread per core
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    import torch
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    from services.sentiment import SentimentAnalyzer
+
+    _worker_analyzer = SentimentAnalyzer(device="cpu", **analyzer_kwargs)
+
+
+def _predict_shard(texts: List[str], batch_size: int, max_tokens: Optional[int]) -> List[Dict]:
+    return _worker_analyzer.predict_batch(texts, batch_size=batch_size, max_tokens=max_tokens)
+
+
+def _warmup_worker(_) -> int:
+    _worker_analyzer.predict_batch(["warmup"] * 4)
+    return os.getpid()
+
+
+def default_split(cores: Optional[int] = None) -> Tuple[int, int]:
+    """Tebakan awal tanpa benchmark: thread per worker sebanyak mungkin sampai 4, membagi habis core."""
+    cores = cores or os.cpu_count() or 1
+    threads = max(t for t in range(1, min(4, cores) + 1) if cores % t == 0)
+    return cores // threads, threads
+
+
+def candidate_splits(cores: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Semua pembagian workers x threads yang memakai seluruh core (threads membagi habis `cores`)."""
+    cores = cores or os.cpu_count() or 1
+    return [(cores // threads, threads) for threads in range(1, cores + 1) if cores % threads == 0]
+
+
+class ShardedInferenceEngine:
+    """
+    Inference CPU multi-proses untuk job offline besar (mis. batch_scorer).
+    Tiap worker memuat model sekali dengan `threads_per_worker` thread PyTorch,
+    input dipecah per `shard_size` teks, dan hasil dikembalikan sesuai urutan
+    input. Paling banyak `max_inflight` shard diproses/antre sekaligus, jadi
+    input berupa generator besar tidak ditarik semuanya ke memori.
+
+    Catatan: tiap worker memegang salinan model sendiri (~1 GB untuk
+    xlm-roberta-base), jadi `workers` juga dibatasi RAM, bukan hanya core.
+    `predict_batch` sama dengan `SentimentAnalyzer`; `iter_predict` untuk input besar/generator.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        shard_size: int = 256,
+        max_inflight: Optional[int] = None,
+        **analyzer_kwargs,
+    ):
+        self.workers = workers or default_split()[0]
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // self.workers
+        )
+        self.shard_size = shard_size
+        self.max_inflight = max_inflight or 2 * self.workers
+        self.analyzer_kwargs = analyzer_kwargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        if self._pool is not None:
+            return
+        # spawn: fork setelah torch di-import bisa deadlock di thread pool OpenMP
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.analyzer_kwargs),
+        )
+        # paksa semua worker memuat model sekarang, bukan di shard pertama
+        list(self._pool.map(_warmup_worker, range(self.workers)))
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def iter_predict(
+        self, texts: Iterable[str], batch_size: int = 32, max_tokens: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """Yield hasil per shard, urut sesuai input, begitu shard terdepan selesai."""
+        self.start()
+        source = iter(texts)
+        pending = deque()
+
+        def submit_next() -> bool:
+            shard = list(islice(source, self.shard_size))
+            if not shard:
+                return False
+            pending.append(self._pool.submit(_predict_shard, shard, batch_size, max_tokens))
+            return True
+
+        while len(pending) < self.max_inflight and submit_next():
+            pass
+        try:
+            while pending:
+                results = pending.popleft().result()
+                submit_next()
+                yield results
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def predict_batch(
+        self, texts: List[str], batch_size: int = 32, max_tokens: Optional[int] = None
+    ) -> List[Dict]:
+        return [r for part in self.iter_predict(texts, batch_size, max_tokens) for r in part]
+
+
+def autotune(
+    texts: List[str],
+    splits: Optional[List[Tuple[int, int]]] = None,
+    batch_size: int = 32,
+    shard_size: int = 256,
+    **analyzer_kwargs,
+) -> List[Dict]:
+    """
+    Ukur throughput tiap pembagian workers x threads pada `texts` (sampel dari
+    job yang sebenarnya) dan kembalikan hasilnya, terbaik di depan. Waktu load
+    model tidak ikut dihitung. Tiap kandidat memuat model ulang, jadi pakai
+    sampel beberapa ratus teks saja.
+    """
+    report = []
+    for workers, threads in splits or candidate_splits():
+        engine = ShardedInferenceEngine(
+            workers, threads, shard_size=shard_size, **analyzer_kwargs
+        )
+        with engine:
+            start = time.perf_counter()
+            engine.predict_batch(texts, batch_size=batch_size)
+            seconds = time.perf_counter() - start
+        report.append(
+            {
+                "workers": workers,
+                "threads_per_worker": threads,
+                "seconds": seconds,
+                "texts_per_sec": len(texts) / seconds if seconds else 0.0,
+            }
+        )
+        print(f"[TUNE] {workers} worker x {threads} thread: {report[-1]['texts_per_sec']:.1f} teks/detik")
+    return sorted(report, key=lambda r: r["texts_per_sec"], reverse=True)
+
+
+if __name__ == "__main__":
+    # jalankan dari folder backend: python -m services.sharded --csv dataset_tweets.csv
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Cari pembagian workers x threads tercepat")
+    parser.add_argument("--csv", required=True, help="CSV dengan kolom teks tweet")
+    parser.add_argument("--column", default="text")
+    parser.add_argument("--limit", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--shard-size", type=int, default=256)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv)[args.column].dropna().astype(str).tolist()[: args.limit]
+    report = autotune(texts, batch_size=args.batch_size, shard_size=args.shard_size)
+    best = report[0]
+    print(
+        f"✅ Terbaik: {best['workers']} worker x {best['threads_per_worker']} thread "
+        f"({best['texts_per_sec']:.1f} teks/detik)"
+    )
@@ -0,0 +1,93 @@
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+# endpoint GraphQL yang membawa hasil pencarian (f=live)
+TIMELINE_URL_MARKERS = ("/SearchTimeline",)
+CREATED_AT_FORMAT = "%a %b %d %H:%M:%S %z %Y"  # "Wed Oct 10 20:19:24 +0000 2018"
+
+
+def is_timeline_response(url: str) -> bool:
+    return "/graphql/" in url and any(m in url for m in TIMELINE_URL_MARKERS)
+
+
+def _iter_tweet_results(node) -> Iterator[Dict]:
+    """
+    Cari semua objek `tweet_results.result` di payload, di kedalaman berapa pun.
+    Lebih tahan terhadap perubahan struktur instructions/entries dari X.
+    """
+    if isinstance(node, dict):
+        result = (node.get("tweet_results") or {}).get("result")
+        if isinstance(result, dict):
+            yield result
+        for value in node.values():
+            yield from _iter_tweet_results(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_tweet_results(value)
+
+
+def _unwrap(result: Dict) -> Dict:
+    # tweet dengan batasan visibilitas dibungkus satu level lagi
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        return result.get("tweet", {})
+    return result
+
+
+def _parse_created_at(value: str) -> str:
+    try:
+        return datetime.strptime(value, CREATED_AT_FORMAT).isoformat()
+    except (TypeError, ValueError):
+        return datetime.now().isoformat()
+
+
+def parse_tweet(result: Dict) -> Dict | None:
+    """Ubah satu objek tweet GraphQL jadi record {id, timestamp, text, author, ...}."""
+    tweet = _unwrap(result)
+    legacy = tweet.get("legacy")
+    tweet_id = tweet.get("rest_id") or (legacy or {}).get("id_str")
+    if not legacy or not tweet_id:
+        return None
+
+    # tweet panjang (> 280 char) teks lengkapnya ada di note_tweet
+    note = tweet.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
+    text = note.get("text") or legacy.get("full_text", "")
+
+    user = tweet.get("core", {}).get("user_results", {}).get("result", {})
+    screen_name = user.get("core", {}).get("screen_name") or user.get("legacy", {}).get(
+        "screen_name", ""
+    )
+    return {
+        "id": str(tweet_id),
+        "timestamp": _parse_created_at(legacy.get("created_at")),
+        "text": text,
+        "author": screen_name,
+        "is_retweet": "retweeted_status_result" in legacy,
+        "lang": legacy.get("lang", ""),
+    }
+
+
+def parse_timeline_payload(payload: Dict) -> List[Dict]:
+    """
+    Parse satu response JSON timeline X jadi list tweet (urutan sesuai payload,
+    duplikat id dalam payload yang sama dibuang; retweet/quote ikut diambil).
+    """
+    tweets, ids = [], set()
+    for result in _iter_tweet_results(payload):
+        record = parse_tweet(result)
+        if record and record["id"] not in ids:
+            ids.add(record["id"])
+            tweets.append(record)
+    return tweets
+
+
+if __name__ == "__main__":
+    # cek parser secara offline dengan response yang disimpan:
+    #   python -m services.timeline_parser debug/timeline/*.json
+    for path in sys.argv[1:]:
+        with open(path, "r", encoding="utf-8") as fh:
+            records = parse_timeline_payload(json.load(fh))
+        print(f"{path}: {len(records)} tweets")
+        for r in records:
+            print(f"  {r['id']} @{r['author']} {r['timestamp']} {r['text'][:60]!r}")
@@ -0,0 +1,38 @@
+# Script JS untuk membaca tweet dari DOM timeline X, dipakai backend (services.scraper)
+# maupun tweets_scraper.py di root. Modul ini sengaja tanpa dependency (seperti
+# services.seen_store) supaya bisa di-import dari kedua sisi.
+
+# Ambil semua tweet baru dalam satu page.evaluate (satu round trip per scroll).
+# Key stabil per article = link /status/<id> (fallback: teksnya); article yang sudah
+# diproses ditandai dengan key-nya, jadi scroll berikutnya hanya membaca node baru.
+# Kalau X memakai ulang node untuk tweet lain, key-nya beda dan node diproses lagi.
+EXTRACT_NEW_TWEETS_JS = """
+() => {
+  const out = [];
+  for (const article of document.querySelectorAll('article')) {
+    const textEl = article.querySelector('div[data-testid="tweetText"]');
+    if (!textEl) continue;
+    const link = article.querySelector('a[href*="/status/"] time')?.closest('a');
+    const key = link ? link.getAttribute('href') : textEl.innerText;
+    if (article.dataset.xaiKey === key) continue;
+    article.dataset.xaiKey = key;
+    out.push({ key: key, text: textEl.innerText });
+  }
+  return out;
+}
+"""
+
+# ada article yang key-nya belum diproses -> timeline sudah memuat tweet baru. Key dihitung
+# ulang, bukan cek atribut data-xai-key saja: node yang dipakai ulang X masih membawa key lama.
+HAS_NEW_TWEET_NODE_JS = """
+() => {
+  for (const article of document.querySelectorAll('article')) {
+    const textEl = article.querySelector('div[data-testid="tweetText"]');
+    if (!textEl) continue;
+    const link = article.querySelector('a[href*="/status/"] time')?.closest('a');
+    const key = link ? link.getAttribute('href') : textEl.innerText;
+    if (article.dataset.xaiKey !== key) return true;
+  }
+  return false;
+}
+"""
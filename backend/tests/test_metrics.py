@@ -0,0 +1,10 @@
+from services.metrics import _format_labels
+
+
+def test_label_values_are_escaped():
+    labels = _format_labels(("path", "q"), ('C:\\tmp', 'say "hi"\nbye'))
+    assert labels == '{path="C:\\\\tmp",q="say \\"hi\\"\\nbye"}'
+
+
+def test_extra_label_is_appended():
+    assert _format_labels(("stage",), ("forward",), 'le="0.5"') == '{stage="forward",le="0.5"}'
@@ -0,0 +1,27 @@
+from services.near_dup import NearDuplicateIndex, cluster_texts
+
+
+def test_retweets_and_copies_are_collapsed():
+    texts = [
+        "RT @budi: Promo HP Samsung Galaxy murah banget hari ini https://t.co/abc",
+        "@ani Promo HP Samsung Galaxy murah banget hari ini https://t.co/xyz",
+        "Promo HP Samsung Galaxy murah banget hari ini!!",
+    ]
+    assert cluster_texts(texts) == [0, 0, 0]
+
+
+def test_opposite_sentiment_is_not_collapsed():
+    texts = [
+        "Baru beli HP Samsung Galaxy A55 kemarin, hasil fotonya bagus banget kameranya",
+        "Baru beli HP Samsung Galaxy A55 kemarin, hasil fotonya jelek banget kameranya",
+        "Baterai HP Samsung Galaxy A55 ini awet banget dipakai seharian buat main game",
+        "Baterai HP Samsung Galaxy A55 ini boros banget dipakai seharian buat main game",
+        "Baterai HP Samsung Galaxy A55 ini tidak awet banget dipakai seharian buat main game",
+    ]
+    assert cluster_texts(texts) == [0, 1, 2, 3, 4]
+    index = NearDuplicateIndex()
+    assert [index.add(t)[1] for t in texts] == [False] * len(texts)
+
+
+def test_fingerprint_less_texts_stay_separate():
+    assert cluster_texts(["🔥🔥", "😡😡", "https://t.co/a", "@budi", "🔥🔥"]) == [0, 1, 2, 3, 4]
@@ -0,0 +1,60 @@
+from itertools import product
+
+import pytest
+
+from services.normalize import (
+    EDGE_CASES,
+    get_normalizer,
+    normalize_batch,
+    reference_clean_text,
+    synthetic_tweets,
+)
+
+OPTION_NAMES = ["keep_hashtag_text", "replace_mentions_with_tag", "lower", "remove_emojis"]
+ALL_OPTIONS = [dict(zip(OPTION_NAMES, combo)) for combo in product([True, False], repeat=4)]
+TEXTS = EDGE_CASES + synthetic_tweets(2000)
+
+
+@pytest.mark.parametrize("options", ALL_OPTIONS, ids=lambda o: ",".join(k for k, v in o.items() if v) or "none")
+def test_normalizer_matches_reference(options):
+    fn = get_normalizer(**options)
+    mismatches = [
+        (text, reference_clean_text(text, **options), fn(text))
+        for text in TEXTS
+        if reference_clean_text(text, **options) != fn(text)
+    ]
+    assert mismatches == []
+
+
+def test_normalize_batch_keeps_order():
+    texts = synthetic_tweets(50, seed=1)
+    assert normalize_batch(texts) == [reference_clean_text(t) for t in texts]
+
+
+def test_default_cleaning():
+    assert get_normalizer()(
+        "Mantap bgt produk @samsung_id #GalaxyS24 🔥🔥🔥 https://t.co/xyz"
+    ) == "Mantap bgt produk @user GalaxyS24 🔥🔥"
+
+
+# services/model.py dulu punya cleaner 4-regex sendiri (URL http*, mention, hashtag,
+# whitespace); sekarang lewat normalize.py. Tweet biasa hasilnya sama persis...
+MODEL_CLEAN_UNCHANGED = [
+    ("Promo @samsung_id hari ini https://t.co/abc #GalaxyS24 mantap", "Promo @user hari ini mantap"),
+    ("RT @budi: baterai awet   banget\n#hp", "RT @user: baterai awet banget"),
+]
+# ...tapi sengaja berbeda di sini: entity HTML di-unescape, huruf/emoji berulang
+# dipadatkan jadi dua, dan URL tanpa http (www.) ikut dibuang
+MODEL_CLEAN_CHANGED = [
+    ("Harga &amp; kualitas oke", "Harga & kualitas oke"),
+    ("kereeeen bangettt!!!", "kereen bangett!!"),
+    ("cek www.tokohp.id sekarang", "cek sekarang"),
+    ("Mantap 🔥🔥🔥", "Mantap 🔥🔥"),
+]
+
+
+@pytest.mark.parametrize("text, expected", MODEL_CLEAN_UNCHANGED + MODEL_CLEAN_CHANGED)
+def test_model_clean_text(text, expected):
+    from services.model import SentimentAnalyzer
+
+    assert SentimentAnalyzer.__new__(SentimentAnalyzer).clean_text(text) == expected
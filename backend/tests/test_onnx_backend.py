@@ -0,0 +1,23 @@
+import os
+
+from services.onnx_backend import onnx_cache_dir
+
+
+def test_cache_dir_follows_local_weights(tmp_path):
+    model = tmp_path / "org__model"
+    model.mkdir()
+    (model / "config.json").write_text("{}")
+    (model / "model.safetensors").write_bytes(b"v1")
+    first = onnx_cache_dir(str(model), root="cache")
+    assert first == onnx_cache_dir(str(model), root="cache")
+    assert os.path.basename(first).startswith("org__model-")
+
+    # registry update: folder sama, bobot baru -> folder export baru
+    (model / "model.safetensors").write_bytes(b"v2-longer")
+    assert onnx_cache_dir(str(model), root="cache") != first
+
+
+def test_cache_dir_for_hub_name_uses_revision():
+    a = onnx_cache_dir("org/model", revision="abc", root="cache")
+    assert a != onnx_cache_dir("org/model", revision="def", root="cache")
+    assert os.path.basename(a).startswith("org__model-")
@@ -0,0 +1,16 @@
+from services.sharded import candidate_splits, default_split
+
+
+def test_candidate_splits_use_every_core():
+    assert candidate_splits(12) == [(12, 1), (6, 2), (4, 3), (3, 4), (2, 6), (1, 12)]
+    assert candidate_splits(6) == [(6, 1), (3, 2), (2, 3), (1, 6)]
+    assert candidate_splits(1) == [(1, 1)]
+    for cores in range(1, 33):
+        assert all(w * t == cores for w, t in candidate_splits(cores))
+
+
+def test_default_split():
+    assert default_split(16) == (4, 4)
+    assert default_split(6) == (2, 3)
+    assert default_split(2) == (1, 2)
+    assert default_split(7) == (7, 1)
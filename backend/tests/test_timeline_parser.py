@@ -0,0 +1,64 @@
+import json
+import os
+
+from services.timeline_parser import is_timeline_response, parse_timeline_payload
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "search_timeline.json")
+
+
+def _load():
+    with open(FIXTURE, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def test_parses_tweets_in_payload_order_without_duplicates():
+    records = parse_timeline_payload(_load())
+    assert [r["id"] for r in records] == [
+        "1978300000000000001",
+        "1978300000000000002",
+        "1978300000000000003",
+        "1978300000000000004",
+        "1978300000000000005",
+    ]
+
+
+def test_record_fields():
+    first = parse_timeline_payload(_load())[0]
+    assert first == {
+        "id": "1978300000000000001",
+        "timestamp": "2025-10-15T08:12:45+00:00",
+        "text": "Baterai Samsung baru ini awet banget, seharian masih 40% 🔋",
+        "author": "budi_santoso",
+        "is_retweet": False,
+        "lang": "in",
+    }
+
+
+def test_payload_variants():
+    records = {r["id"]: r for r in parse_timeline_payload(_load())}
+    # screen_name lama masih di user.legacy
+    assert records["1978300000000000002"]["author"] == "ani_w"
+    # TweetWithVisibilityResults dibuka satu level
+    assert records["1978300000000000003"]["author"] == "tokohp"
+    # tweet panjang: teks lengkap dari note_tweet, bukan full_text yang terpotong
+    long_text = records["1978300000000000004"]["text"]
+    assert not long_text.endswith("…") and len(long_text) > 280
+    # retweet ditandai; tweet asli di dalamnya tidak ikut jadi record sendiri
+    assert records["1978300000000000005"]["is_retweet"] is True
+    assert "1978200000000000009" not in records
+
+
+def test_tombstones_and_cursors_are_skipped():
+    instructions = _load()["data"]["search_by_raw_query"]["search_timeline"]["timeline"]["instructions"]
+    noise = [
+        e for e in instructions[0]["entries"]
+        if e["entryId"].startswith("cursor-") or e["entryId"] == "tweet-1978300000000000006"
+    ]
+    assert len(noise) == 3
+    assert parse_timeline_payload({"entries": noise}) == []
+
+
+def test_is_timeline_response():
+    assert is_timeline_response("https://x.com/i/api/graphql/AbC123/SearchTimeline?variables=%7B%7D")
+    assert not is_timeline_response("https://x.com/i/api/graphql/AbC123/UserByScreenName?variables=%7B%7D")
+    assert not is_timeline_response("https://x.com/search?q=SearchTimeline")
@@ -0,0 +1,53 @@
+import numpy as np
+
+from services.sentiment import SentimentAnalyzer, padding_stats, plan_token_batches
+
+
+def test_plan_respects_budget_and_covers_every_index():
+    lengths = [5, 30, 12, 7, 30, 3, 18]
+    batches = plan_token_batches(lengths, max_tokens=40)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 40
+    # diurutkan per panjang: batch pertama berisi yang terpendek
+    assert batches[0][0] == 5
+
+
+def test_sequence_over_budget_gets_own_batch():
+    batches = plan_token_batches([4, 100, 4], max_tokens=16)
+    assert [1] in batches
+    assert sorted(i for b in batches for i in b) == [0, 1, 2]
+
+
+def test_empty_input():
+    assert plan_token_batches([], max_tokens=64) == []
+    assert padding_stats([], [])["padding_waste"] == 0.0
+
+
+def test_padding_stats():
+    stats = padding_stats([2, 4], [[0, 1]])
+    assert stats == {"batches": 1, "real_tokens": 6, "padded_tokens": 8, "padding_waste": 0.25}
+
+
+class _FakeTokenizer:
+    """Token id = index teks, panjang = jumlah kata; cukup untuk melacak urutan."""
+
+    def __call__(self, texts, **kwargs):
+        return {"input_ids": [[i] * len(t.split()) for i, t in enumerate(texts)]}
+
+    def pad(self, encoded, **kwargs):
+        ids = encoded["input_ids"]
+        longest = max(len(x) for x in ids)
+        return {"input_ids": [x + [-1] * (longest - len(x)) for x in ids]}
+
+
+def test_bucketed_probs_return_in_input_order():
+    analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+    analyzer.labels = ["Negative", "Neutral", "Positive"]
+    analyzer.tokenizer = _FakeTokenizer()
+    analyzer._forward = lambda inputs: np.array(
+        [[row[0], 0.0, 0.0] for row in inputs["input_ids"]], dtype=np.float32
+    )
+    texts = ["a " * n for n in (9, 1, 5, 12, 2, 9, 3)]
+    probs = analyzer._probs_bucketed(texts, max_tokens=12)
+    assert probs[:, 0].tolist() == list(range(len(texts)))
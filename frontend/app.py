@@ -1,4 +1,6 @@
 import os
+import json
+import time
 from dotenv import load_dotenv
 import streamlit as st
 import httpx
@@ -9,11 +11,41 @@ from visualize import plot_bar_chart, plot_pie_chart, plot_wordcloud, plot_ngram
 # Inisialisasi Environtment
 # ================================
 load_dotenv()
-API_URL = os.getenv("BASE_URL")
+API_URL = os.getenv("BASE_URL") or "http://localhost:8000"
 
 st.set_page_config(page_title="xAI Sentiment Analyst", layout="wide")
 st.title("🐦 xAI Sentiment Analyst")
 
+
+JOB_POLL_SECONDS = 1.0
+# batas tunggu job scrape; lewat dari ini job dibatalkan dan hasil parsialnya dipakai
+JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", "600"))
+
+
+@st.cache_resource(show_spinner=False)
+def get_client() -> httpx.Client:
+    """Satu httpx.Client (connection pool keep-alive) untuk semua rerun & session."""
+    return httpx.Client(
+        base_url=API_URL,
+        timeout=120.0,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    )
+
+
+def fetch_job_results(client: httpx.Client, job_id: str, page_size: int = 500) -> list:
+    """Ambil semua hasil job per halaman (GET /jobs/{id}/results)."""
+    rows, offset = [], 0
+    while offset is not None:
+        resp = client.get(
+            f"/jobs/{job_id}/results", params={"offset": offset, "limit": page_size}
+        )
+        resp.raise_for_status()
+        page = resp.json()
+        rows.extend(page["results"])
+        offset = page["next_offset"] if page["count"] else None
+    return rows
+
+
 # ================================
 # Inisialisasi Session State
 # ================================
@@ -21,6 +53,10 @@ if "df" not in st.session_state:
     st.session_state.df = None
 if "analyzed" not in st.session_state:
     st.session_state.analyzed = False
+if "query" not in st.session_state:
+    st.session_state.query = None
+if "summary" not in st.session_state:
+    st.session_state.summary = None
 
 # ================================
 # Scraping Form
@@ -34,30 +70,50 @@ if submitted:
     if not query.strip():
         st.warning("⚠️ Keyword/topik tidak boleh kosong.")
     else:
-        with st.spinner("⚡ Scraping in progress..."):
-            try:
-                resp = httpx.post(
-                    "http://localhost:8000/scrape",
-                    json={"query": query, "limit": limit},
-                    timeout=120.0,
+        # scraping jalan sebagai job di backend, jadi tidak terikat timeout request;
+        # frontend cukup polling status lalu ambil hasilnya per halaman
+        progress = st.progress(0.0, text="⚡ Scraping in progress...")
+        try:
+            client = get_client()
+            resp = client.post("/jobs/scrape", json={"query": query, "limit": limit})
+            if resp.status_code != 202:
+                raise RuntimeError(f"Status code: {resp.status_code} - {resp.text}")
+            job = resp.json()
+            deadline = time.monotonic() + JOB_MAX_WAIT_SECONDS
+            while job["status"] in ("queued", "running"):
+                if time.monotonic() > deadline:
+                    # job macet/terlalu lama: batalkan, tweet yang sudah tertangkap tetap diambil
+                    job = client.delete(f"/jobs/{job['job_id']}").raise_for_status().json()
+                    st.warning(
+                        f"⏱️ Scraping melebihi {JOB_MAX_WAIT_SECONDS:.0f} detik dan dibatalkan; "
+                        "memakai hasil yang sudah terkumpul."
+                    )
+                    break
+                time.sleep(JOB_POLL_SECONDS)
+                job = client.get(f"/jobs/{job['job_id']}").raise_for_status().json()
+                progress.progress(
+                    min(job["count"] / limit, 1.0),
+                    text=f"⚡ {job['count']}/{limit} tweet ({job['status']})",
                 )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    tweets = data.get("tweets", [])
-                    if tweets:
-                        df = pd.DataFrame(tweets)
-                        st.session_state.df = df
-                        st.session_state.analyzed = False
-                        st.success(
-                            f"✅ Dapat {data['count']} tweets untuk '{data['query']}'"
-                        )
-                        st.dataframe(df, use_container_width=True)
-                    else:
-                        st.warning("Tidak ada tweet yang berhasil diambil.")
-                else:
-                    st.error(f"Scraping gagal. Status code: {resp.status_code}")
-            except Exception as e:
-                st.error(f"Gagal konek ke backend: {e}")
+            if job["status"] == "failed" and not job["count"]:
+                raise RuntimeError(job["error"] or "job failed")
+            if job["status"] == "failed":
+                st.warning(f"⚠️ Scraping berhenti karena error ({job['error']}); memakai hasil parsial.")
+
+            tweets = fetch_job_results(client, job["job_id"])
+            if tweets:
+                df = pd.DataFrame(tweets)
+                st.session_state.df = df
+                st.session_state.query = query
+                st.session_state.analyzed = False
+                st.success(f"✅ Dapat {len(tweets)} tweets untuk '{query}'")
+                st.dataframe(df, use_container_width=True)
+            else:
+                st.warning("Tidak ada tweet yang berhasil diambil.")
+        except Exception as e:
+            st.error(f"Scraping gagal: {e}")
+        finally:
+            progress.empty()
 
 # ================================
 # Analisis Sentimen + Visualisasi
@@ -68,51 +124,75 @@ if st.session_state.df is not None:
         if not texts:
             st.warning("⚠️ Tidak ada teks untuk dianalisis.")
         else:
-            with st.spinner("🧠 Mengirimkan ke server untuk analisis..."):
-                try:
-                    resp = httpx.post(
-                        "http://localhost:8000/analyze", json={"texts": texts}, timeout=300.0
-                    )
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        result_df = pd.DataFrame(data["results"])
-                        # merge results back into original df (keep order)
-                        cols = [
-                            "label",
-                            "cleaned_text",
-                            "Negative",
-                            "Neutral",
-                            "Positive",
-                        ]
-                        st.session_state.df = pd.concat(
-                            [
-                                st.session_state.df.reset_index(drop=True),
-                                result_df[cols].reset_index(drop=True),
-                            ],
-                            axis=1,
+            progress = st.progress(0.0, text="🧠 Mengirimkan ke server untuk analisis...")
+            try:
+                # hasil dikirim per batch (NDJSON), jadi progress bisa langsung tampil
+                rows, summary = [], None
+                client = get_client()
+                # ringkasan dihitung backend dari teks request ini saja (baris terakhir stream),
+                # jadi tidak tercampur hasil session/worker lain seperti GET /summary
+                with client.stream(
+                    "POST",
+                    "/analyze/stream",
+                    json={"texts": texts, "summary_top_k": 500},
+                    timeout=300.0,
+                ) as resp:
+                    if resp.status_code != 200:
+                        resp.read()
+                        raise RuntimeError(
+                            f"Status code: {resp.status_code} - {resp.text}"
                         )
-                        st.session_state.analyzed = True
-                        st.success("✅ Analisis sentimen selesai!")
-                        st.dataframe(st.session_state.df, use_container_width=True)
-                    else:
-                        st.error(
-                            f"Analisis gagal. Status code: {resp.status_code} - {resp.text}"
+                    for line in resp.iter_lines():
+                        if not line:
+                            continue
+                        row = json.loads(line)
+                        if "error" in row:
+                            raise RuntimeError(row["error"])
+                        if "summary" in row:
+                            summary = row["summary"]
+                            continue
+                        rows.append(row)
+                        progress.progress(
+                            len(rows) / len(texts),
+                            text=f"🧠 {len(rows)}/{len(texts)} tweet dianalisis",
                         )
-                except Exception as e:
-                    st.error(f"Terjadi suatu kesalahan: {e}")
 
+                result_df = pd.DataFrame(rows).sort_values("index")
+                # merge results back into original df (keep order)
+                cols = [
+                    "label",
+                    "cleaned_text",
+                    "Negative",
+                    "Neutral",
+                    "Positive",
+                ]
+                st.session_state.df = pd.concat(
+                    [
+                        st.session_state.df.reset_index(drop=True),
+                        result_df[cols].reset_index(drop=True),
+                    ],
+                    axis=1,
+                )
+                st.session_state.summary = summary
+                st.session_state.analyzed = True
+                st.success("✅ Analisis sentimen selesai!")
+                st.dataframe(st.session_state.df, use_container_width=True)
+            except Exception as e:
+                st.error(f"Analisis gagal: {e}")
+            finally:
+                progress.empty()
 
-if st.session_state.analyzed and st.session_state.df is not None:
+if st.session_state.analyzed and st.session_state.summary is not None:
     st.subheader("👁️ Visualisasi Sentimen")
 
     col1, col2 = st.columns(2)
     with col1:
-        plot_bar_chart(st.session_state.df)
+        plot_bar_chart(st.session_state.summary)
     with col2:
-        plot_pie_chart(st.session_state.df)
+        plot_pie_chart(st.session_state.summary)
 
     col3, col4 = st.columns(2)
     with col3:
-        plot_wordcloud(st.session_state.df)
+        plot_wordcloud(st.session_state.summary)
     with col4:
-        plot_ngram(st.session_state.df, n=1)
+        plot_ngram(st.session_state.summary, n=1)
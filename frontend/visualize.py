@@ -1,50 +1,100 @@
+import io
 import streamlit as st
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
 import nltk
 from nltk.corpus import stopwords
 
-# pastikan stopwords Indonesia tersedia
-nltk.download("stopwords")
-stop_words = set(stopwords.words("indonesian"))
+# Chart dibuat dari ringkasan yang dihitung backend (SentimentAggregator, dikirim
+# sebagai baris terakhir /analyze/stream dengan summary_top_k), bukan dihitung
+# ulang dari seluruh df.
+# Gambar di-cache berdasarkan isi ringkasannya, jadi rerun Streamlit dengan
+# data yang sama tidak menggambar ulang WordCloud / matplotlib.
 
-def plot_bar_chart(df: pd.DataFrame):
-    counts = df["label"].value_counts()
-    st.markdown("### 📊 Diagram Batang")
-    st.bar_chart(counts)
 
-def plot_pie_chart(df: pd.DataFrame):
-    counts = df["label"].value_counts()
-    if counts.empty: 
-        return
+@st.cache_resource(show_spinner=False)
+def get_stopwords() -> frozenset:
+    """Stopwords Indonesia; download nltk hanya kalau corpus belum ada, sekali per proses."""
+    try:
+        words = stopwords.words("indonesian")
+    except LookupError:
+        nltk.download("stopwords", quiet=True)
+        words = stopwords.words("indonesian")
+    return frozenset(words)
+
+
+def _fig_to_png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    plt.close(fig)  # figure lama tidak menumpuk di memori tiap rerun
+    return buf.getvalue()
+
+
+def label_counts(summary: dict) -> pd.Series:
+    return pd.Series(summary["label_counts"], dtype="int64")
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _pie_png(counts: pd.Series) -> bytes:
     labels, sizes = counts.index.tolist(), counts.values.tolist()
     colors = sns.color_palette("Set2", n_colors=len(labels))
     fig, ax = plt.subplots()
     ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90, colors=colors)
     ax.axis("equal")
-    st.markdown("### 🥧 Diagram Pie")
-    st.pyplot(fig)
+    return _fig_to_png(fig)
+
 
-def plot_wordcloud(df: pd.DataFrame):
-    text = " ".join(df["cleaned_text"].astype(str))
+def ngram_frame(summary: dict, n: int = 1, top_k: int = 10) -> pd.DataFrame:
+    """Top n-gram dari ringkasan, tanpa n-gram yang mengandung stopwords Indonesia."""
+    stop = get_stopwords()
+    rows = [
+        r for r in summary["unigrams" if n == 1 else "bigrams"]
+        if not any(w in stop for w in r["ngram"].split())
+    ]
+    return pd.DataFrame(rows, columns=["ngram", "count"]).head(top_k)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _wordcloud_png(freq_df: pd.DataFrame) -> bytes:
+    frequencies = dict(zip(freq_df["ngram"], freq_df["count"]))
     wc = WordCloud(width=600, height=400, background_color="white",
-                   stopwords=stop_words, colormap="Set2").generate(text)
+                   colormap="Set2").generate_from_frequencies(frequencies)
     fig, ax = plt.subplots()
     ax.imshow(wc, interpolation="bilinear")
     ax.axis("off")
-    st.markdown("### ☁️ Word Cloud")
-    st.pyplot(fig)
-
-def plot_ngram(df: pd.DataFrame, n: int = 1, top_k: int = 10):
-    vectorizer = CountVectorizer(ngram_range=(n, n), stop_words=list(stop_words))
-    X = vectorizer.fit_transform(df["cleaned_text"].astype(str))
-    counts = X.sum(axis=0).A1 # type: ignore
-    vocab = vectorizer.get_feature_names_out()
-    freq_df = pd.DataFrame({"ngram": vocab, "count": counts}).sort_values("count", ascending=False).head(top_k)
+    return _fig_to_png(fig)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _ngram_png(freq_df: pd.DataFrame) -> bytes:
     fig, ax = plt.subplots(figsize=(8, 4))
     sns.barplot(data=freq_df, x="count", y="ngram", palette="Set2", ax=ax)
+    return _fig_to_png(fig)
+
+
+def plot_bar_chart(summary: dict):
+    counts = label_counts(summary)
+    st.markdown("### 📊 Diagram Batang")
+    st.bar_chart(counts)
+
+def plot_pie_chart(summary: dict):
+    counts = label_counts(summary)
+    counts = counts[counts > 0]
+    if counts.empty:
+        return
+    st.markdown("### 🥧 Diagram Pie")
+    st.image(_pie_png(counts))
+
+def plot_wordcloud(summary: dict, max_words: int = 200):
+    freq_df = ngram_frame(summary, n=1, top_k=max_words)
+    if freq_df.empty:
+        return
+    st.markdown("### ☁️ Word Cloud")
+    st.image(_wordcloud_png(freq_df))
+
+def plot_ngram(summary: dict, n: int = 1, top_k: int = 10):
+    freq_df = ngram_frame(summary, n=n, top_k=top_k)
     st.markdown(f"### 📑 Diagram {n}-Gram (Top {top_k})")
-    st.pyplot(fig)
+    st.image(_ngram_png(freq_df))
@@ -1,14 +1,15 @@
 import asyncio
-from helpers.scraper import scrape_search, process_queries
+from tweets_scraper import process_queries
 
 SEARCH_QUERIES = ["samsung"] # tambahkan query lainnya
+CONCURRENCY = 3              # jumlah query yang di-scrape paralel dalam satu browser
+MAX_TWEETS = 100             # budget tweet per query
 
 def main():
   try:
-      asyncio.run(process_queries(SEARCH_QUERIES))
+      asyncio.run(process_queries(SEARCH_QUERIES, concurrency=CONCURRENCY, max_tweets=MAX_TWEETS))
   except KeyboardInterrupt as k:
       print(f"[INFO] 🔴 Stopped by user {k}")
-  asyncio.run(scrape_search(SEARCH_QUERIES))
 
 # if __name__ == "__main__":
 #   main()
@@ -1,15 +1,26 @@
+import re
 import json
+import argparse
+import time
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from helpers.csv_config import ensure_csv_header, save_batch
+from backend.services.seen_store import SeenStore
+from backend.services.tweet_dom import EXTRACT_NEW_TWEETS_JS, HAS_NEW_TWEET_NODE_JS
 
 # ====== CONFIG ======
 COOKIES_FILE = "cookies.json"      # file cookies hasil export dari browser
-OUTPUT_FILE = "dataset_tweets.csv" # file output yang menyimpan hasil scrape
+OUTPUT_FILE = "dataset_tweets.csv" # nama dasar file output; tiap query ke dataset_tweets_<query>.csv
 SEARCH_QUERIES = ["samsung"]       # topik yang ingin di scrape
 MAX_TWEETS = 100                   # simpan tweet ketika sudah mencapai maksimal
 BATCH_SIZE = 10                    # flush/simpan tiap 10 tweet yang sudah diekstrak
+MAX_SCROLL_WAIT_MS = 3000          # batas tunggu tweet baru setelah scroll
+MAX_IDLE_SCROLLS = 3               # berhenti kalau sekian kali scroll berturut-turut tanpa tweet baru
+MAX_RELOADS = 3                    # batas reload halaman kalau ekstraksi gagal
+CONCURRENCY = 1                    # jumlah query yang di-scrape paralel (1 = berurutan)
+SEEN_DIR = None                    # mis. "seen": lewati tweet yang sudah diambil run sebelumnya (None = per run saja)
+SEEN_WINDOW_DAYS = 7               # tweet dianggap baru lagi setelah sekian hari
 
 # =========================
 # SCRAPING SECTION
@@ -62,105 +73,239 @@ async def _load_and_set_cookies(context):
         print(f"🔴[WARNING] gagal load cookies: {e}")
 
 
-async def _extract_and_save_tweets(page, seen, scraped, total_scraped):
+async def _extract_and_save_tweets(page, seen, scraped, total_scraped,
+                                   max_tweets=MAX_TWEETS, output_file=OUTPUT_FILE):
     """
     Extracts tweets from the page and saves them in batches to a CSV file.
 
-    This function scrolls through the page, collects tweet texts, and saves them in batches until the maximum number of tweets is reached.
+    This function scrolls through the page, collects tweet texts, and saves them in batches until the maximum
+    number of tweets is reached, MAX_IDLE_SCROLLS scrolls in a row bring no new tweet (timeline exhausted or
+    everything already seen), or extraction keeps failing after MAX_RELOADS page reloads.
 
     Args:
         page: The Playwright page object to extract tweets from.
-        seen: A set to keep track of unique tweets.
+        seen: SeenStore of article keys already captured.
         scraped: A list to accumulate tweets before batch saving.
         total_scraped: The current count of tweets scraped.
+        max_tweets: Tweet budget for this query.
+        output_file: CSV file the batches are appended to.
 
     Returns:
-        tuple: Updated scraped list, seen set, and total_scraped count.
+        tuple: Updated scraped list, seen store, and total_scraped count.
     """
-    while total_scraped < MAX_TWEETS:
-        tweets = await page.locator('div[data-testid="tweetText"]').all()
-        for t in tweets:
-            try:
-                text = await t.inner_text(timeout=180000)
-                seen.add(text)
-                scraped.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "text": text,
-                })
-                total_scraped += 1
-                print(f"[+] Mengambil {len(tweets)} data tweets")
-                if len(scraped) >= BATCH_SIZE:
-                    save_batch(OUTPUT_FILE, scraped)
-                    print(f"💾[INFO] Flushed {len(scraped)} tweets ke {OUTPUT_FILE}")
-                    scraped.clear()
-                if total_scraped >= MAX_TWEETS:
-                    print(f"🔴[INFO] Batas maksimal tweets tercapai: {MAX_TWEETS}")
-                    break
-            except (asyncio.TimeoutError, Exception) as e:
-                print(f"[ERROR] {type(e).__name__}: {e}")
-                if isinstance(e, asyncio.TimeoutError):
-                    await page.reload(timeout=60000)
-                else:
-                    raise
+    idle_scrolls = 0
+    reloads = 0
+    while total_scraped < max_tweets:
+        t0 = time.perf_counter()
+        try:
+            nodes = await page.evaluate(EXTRACT_NEW_TWEETS_JS)
+        except Exception as e:
+            print(f"[ERROR] {type(e).__name__}: {e}")
+            if reloads >= MAX_RELOADS:
+                print(f"🔴[STOP] Ekstraksi masih gagal setelah {MAX_RELOADS} kali reload")
+                break
+            reloads += 1
+            await page.reload(timeout=60000)
+            continue
+        extract_ms = (time.perf_counter() - t0) * 1000
+
+        new_count = 0
+        for node in nodes:
+            text = node["text"]
+            # satu entry per tweet (link status) supaya fill rate Bloom filter sesuai kapasitasnya
+            if not text or not seen.add(node["key"]):
+                continue
+            scraped.append({
+                "timestamp": datetime.now().isoformat(),
+                "text": text,
+            })
+            total_scraped += 1
+            new_count += 1
+            if len(scraped) >= BATCH_SIZE:
+                save_batch(output_file, scraped)
+                print(f"💾[INFO] Flushed {len(scraped)} tweets ke {output_file}")
+                scraped.clear()
+            if total_scraped >= max_tweets:
+                print(f"🔴[INFO] Batas maksimal tweets tercapai: {max_tweets}")
+                break
+        if total_scraped >= max_tweets:
+            break
+        idle_scrolls = 0 if new_count else idle_scrolls + 1
+        if idle_scrolls >= MAX_IDLE_SCROLLS:
+            print(f"⚠️[STOP] Tidak ada tweet baru setelah {MAX_IDLE_SCROLLS} kali scroll")
+            break
+        # scroll lalu tunggu sampai node tweet baru muncul, bukan sleep 3 detik tetap
+        t0 = time.perf_counter()
         await page.mouse.wheel(0, 2000)
-        await asyncio.sleep(3)
+        try:
+            await page.wait_for_function(HAS_NEW_TWEET_NODE_JS, timeout=MAX_SCROLL_WAIT_MS)
+        except PlaywrightTimeoutError:
+            pass
+        wait_ms = (time.perf_counter() - t0) * 1000
+        print(f"[+] {new_count} tweet baru dari {len(nodes)} node (ekstraksi {extract_ms:.1f} ms, tunggu {wait_ms:.0f} ms)")
     return scraped, seen, total_scraped
 
-async def scrape_search(search_query):
+
+def output_file_for(search_query):
     """
-    Scrapes tweets from X (Twitter) search results for a given query and saves them to a CSV file.
+    Returns the per-query CSV path, e.g. "samsung galaxy" -> dataset_tweets_samsung_galaxy.csv.
+    """
+    slug = re.sub(r"[^\w]+", "_", search_query.strip().lower()).strip("_") or "query"
+    base, ext = OUTPUT_FILE.rsplit(".", 1)
+    return f"{base}_{slug}.{ext}"
 
-    This function automates a browser session, loads authentication cookies, navigates to the search page, and collects tweets in batches until a maximum is reached.
+
+async def _scrape_in_browser(browser, search_query, max_tweets=MAX_TWEETS, output_file=OUTPUT_FILE,
+                             seen_dir=SEEN_DIR):
+    """
+    Scrapes one query in its own context of an already running browser.
 
     Args:
+        browser: The Playwright browser to open the context in.
         search_query: The search term to use for scraping tweets.
+        max_tweets: Tweet budget for this query.
+        output_file: CSV file the tweets are written to.
+        seen_dir: Folder of persistent per-query seen stores; None keeps dedup in memory for this run only.
+
+    Returns:
+        int: Number of tweets saved.
     """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        
+    context = await browser.new_context()
+    seen = None
+    try:
         await _load_and_set_cookies(context)
-        
+
         page = await context.new_page()
         url = f"https://x.com/search?q={search_query}&src=typed_query&f=live"
-        
+
         await page.goto(url, wait_until='domcontentloaded', timeout=60000)
         await page.wait_for_selector('article div[data-testid="tweetText"]', timeout=180000)
-        
+
         scraped = []
-        seen = set()
+        # memori terbatas; dengan seen_dir disimpan per query, jadi run berikutnya tidak mengambil ulang
+        seen = SeenStore(search_query, root=seen_dir, window_days=SEEN_WINDOW_DAYS)
         total_scraped = 0
-        
-        ensure_csv_header(OUTPUT_FILE)
-        
-        print(f"📝[INFO] Membuat file output {OUTPUT_FILE}")
+
+        ensure_csv_header(output_file)
+
+        print(f"📝[INFO] Membuat file output {output_file}")
         print(f"🔍[RUNNING] Memulai scraping dengan query: {search_query} (CTRL+C to stop)")
-        
-        scraped, seen, total_scraped = await _extract_and_save_tweets(page, seen, scraped, total_scraped)
-        
+
+        scraped, seen, total_scraped = await _extract_and_save_tweets(
+            page, seen, scraped, total_scraped, max_tweets=max_tweets, output_file=output_file
+        )
+
         # simpan sisa batch kalau ada
         if scraped:
-            save_batch(OUTPUT_FILE, scraped)
-            print(f"💾[INFO] Flushed {len(scraped)} tweets terakhir ke {OUTPUT_FILE}")
+            save_batch(output_file, scraped)
+            print(f"💾[INFO] Flushed {len(scraped)} tweets terakhir ke {output_file}")
 
-        print(f"\n✅[INFO] Selesai! Total {len(total_scraped)} tweets tersimpan di {OUTPUT_FILE}")
-        
+        print(f"\n✅[INFO] Selesai! Total {total_scraped} tweets tersimpan di {output_file}")
+        return total_scraped
+    finally:
+        if seen is not None:
+            await asyncio.to_thread(seen.save)
         await context.close()
+
+
+async def scrape_search(search_query):
+    """
+    Scrapes tweets from X (Twitter) search results for a given query and saves them to the query's CSV file (see `output_file_for`).
+
+    This function automates a browser session, loads authentication cookies, navigates to the search page, and collects tweets in batches until a maximum is reached.
+
+    Args:
+        search_query: The search term to use for scraping tweets.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        await _scrape_in_browser(browser, search_query, output_file=output_file_for(search_query))
         await browser.close()
 
-async def process_queries():
+
+def _print_summary(results, elapsed):
+    """
+    Prints tweets and tweets/sec per successful query and overall, then failed queries separately.
+
+    Args:
+        results: List of (query, tweets, seconds, error) tuples; tweets is None for failed queries.
+        elapsed: Wall-clock seconds for the whole run.
+    """
+    succeeded = [r for r in results if r[3] is None]
+    failed = [r for r in results if r[3] is not None]
+    print("\n📊[SUMMARY]")
+    print(f"{'query':<30} {'tweets':>7} {'detik':>8} {'tweets/s':>9}")
+    for query, count, seconds, _ in succeeded:
+        rate = count / seconds if seconds else 0.0
+        print(f"{query[:30]:<30} {count:>7} {seconds:>8.1f} {rate:>9.2f}")
+    total = sum(r[1] for r in succeeded)
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{'TOTAL':<30} {total:>7} {elapsed:>8.1f} {rate:>9.2f}")
+    if failed:
+        print(f"\n❌[GAGAL] {len(failed)} query")
+        for query, _, seconds, error in failed:
+            print(f"{query[:30]:<30} {seconds:>8.1f}s  {error}")
+
+
+async def process_queries(queries=None, concurrency=CONCURRENCY, max_tweets=MAX_TWEETS, seen_dir=SEEN_DIR):
     """
     Processes all search queries and initiates scraping for each one.
 
-    This function iterates through the configured list of search queries and calls the scraping routine for each.
+    All queries share one browser, each in its own context; up to `concurrency` run in
+    parallel. Every query writes its own file (see `output_file_for`) and gets its own
+    `max_tweets` budget. A tweets/sec summary is printed at the end, with failed queries
+    listed separately instead of being counted as 0 tweets.
 
+    Args:
+        queries: Search terms to scrape (defaults to SEARCH_QUERIES).
+        concurrency: Maximum number of queries scraped at the same time.
+        max_tweets: Tweet budget per query.
+        seen_dir: Folder of persistent per-query seen stores (None = dedup within this run only).
+
+    Returns:
+        list: (query, tweets, seconds, error) per query; tweets is None and error is set for failed queries.
     """
-    for query in SEARCH_QUERIES:
-        print(f"\n📝[INFO] Memulai scraping untuk topik: '{query}'")
-        await scrape_search(query)
+    queries = queries or SEARCH_QUERIES
+    started = time.perf_counter()
+    results = []
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(query):
+            async with slots:
+                print(f"\n📝[INFO] Memulai scraping untuk topik: '{query}'")
+                t0 = time.perf_counter()
+                try:
+                    # selalu satu file per query, berurutan maupun paralel
+                    count = await _scrape_in_browser(
+                        browser, query, max_tweets=max_tweets, output_file=output_file_for(query),
+                        seen_dir=seen_dir,
+                    )
+                    error = None
+                except Exception as e:
+                    print(f"[ERROR] query '{query}': {type(e).__name__}: {e}")
+                    count, error = None, f"{type(e).__name__}: {e}"
+                results.append((query, count, time.perf_counter() - t0, error))
+
+        try:
+            await asyncio.gather(*(run(q) for q in queries))
+        finally:
+            await browser.close()
+            _print_summary(results, time.perf_counter() - started)
+    return results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape tweet X per query ke CSV")
+    parser.add_argument(
+        "--seen-dir", default=SEEN_DIR,
+        help="simpan tweet yang sudah diambil per query di folder ini dan lewati di run berikutnya",
+    )
+    args = parser.parse_args()
     try:
-        asyncio.run(process_queries())
+        results = asyncio.run(process_queries(seen_dir=args.seen_dir))
+        if any(error for *_, error in results):
+            raise SystemExit(1)
     except KeyboardInterrupt as k:
         print(f"[INFO] 🔴 Dihentikan oleh user {k}")